@@ -1,115 +1,111 @@
 
+import numpy as np
 import pandas as pd
 import random
-from sqlalchemy.orm import sessionmaker
-from database import engine, Sorteo
-
+import consultas
+from cache_sorteos import get_draws
+from ventanas import get_prefix
+from bitset import mascaras
+from metricas import cronometrado
+from database import HOT_WINDOW, TOTAL_NUMBERS
+
+NUM_COLUMNS = ['n1', 'n2', 'n3', 'n4', 'n5', 'n6']
+# Full-size generar_tickets batches in a row without a new ticket before giving up
+MAX_RONDAS_VACIAS = 20
+
+@cronometrado
 def get_data(modalidad):
-    """Loads draw data for a specific modality into a DataFrame."""
-    query = f"SELECT * FROM sorteos WHERE modalidad = '{modalidad}'"
-    df = pd.read_sql(query, engine)
+    """Loads draw data for a specific modality into a DataFrame (from the draw cache)."""
+    draws = get_draws(modalidad)
+    df = pd.DataFrame(draws.numeros, columns=NUM_COLUMNS)
+    df.insert(0, 'modalidad', modalidad)
+    df.insert(0, 'sorteo_id', draws.ids)
+    df.insert(0, 'fecha', draws.fechas)
     return df
 
+@cronometrado
+def get_stats(modalidad):
+    """
+    Reads the 46 incrementally maintained rows of the estadisticas table.
+
+    Returns:
+        dict of arrays indexed by number (frecuencia, ultimo, fecha, ventana),
+        or None when the modality has no draws.
+    """
+    return consultas.estadisticas(modalidad)
+
+def hot_from_counts(counts, top=10):
+    """Most frequent numbers (count > 0), ties broken by the smaller number."""
+    order = np.argsort(-counts, kind='stable')
+    return order[counts[order] > 0][:top].tolist()
+
+@cronometrado
 def get_hot_numbers(modalidad, last_n=50):
     """
     Returns the top 10 most frequent numbers in the last N draws.
     """
-    df = get_data(modalidad)
-    if df.empty:
-        return []
+    if last_n == HOT_WINDOW:
+        stats = get_stats(modalidad)
+        return [] if stats is None else hot_from_counts(stats['ventana'])
 
-    # Sort by date/id descending to get recent ones
-    # Assuming higher ID = more recent
-    df = df.sort_values(by='sorteo_id', ascending=False).head(last_n)
+    # Any other window: one subtraction over the prefix-sum counts
+    prefix = get_prefix(modalidad)
+    if len(prefix) == 0:
+        return []
+    return hot_from_counts(prefix.ultimos(last_n))
 
-    # Melt the number columns into a single Series
-    numbers = pd.melt(df, value_vars=['n1', 'n2', 'n3', 'n4', 'n5', 'n6'])['value']
-    
-    # Count frequencies
-    hot_counts = numbers.value_counts().head(10)
-    return hot_counts.index.tolist()
+@cronometrado
+def get_window_counts(modalidad, desde_id=None, hasta_id=None):
+    """
+    Frequency of every number over the draws with desde_id <= sorteo_id <= hasta_id.
 
+    Returns:
+        dict: draws in the window, the 46 counts and the hot numbers of the window.
+    """
+    prefix = get_prefix(modalidad)
+    i, j = prefix.posiciones(desde_id, hasta_id)
+    counts = prefix.contar(i, j)
+    return {
+        "from": int(prefix.ids[i]) if i < j else None,
+        "to": int(prefix.ids[j - 1]) if i < j else None,
+        "draws": j - i,
+        "counts": counts.tolist(),
+        "hot": hot_from_counts(counts),
+    }
+
+@cronometrado
 def get_cold_numbers(modalidad):
     """
     Returns the top 10 numbers that haven't appeared for the longest time.
     """
-    df = get_data(modalidad)
-    if df.empty:
+    stats = get_stats(modalidad)
+    if stats is None:
         return []
 
-    # Sort by ID ascending (oldest to newest) to iterate properly
-    df = df.sort_values(by='sorteo_id', ascending=True)
-
-    last_seen = {}
-    
-    # Iterate through all draws to update the last seen ID for each number
-    for _, row in df.iterrows():
-        current_id = row['sorteo_id']
-        nums = [row['n1'], row['n2'], row['n3'], row['n4'], row['n5'], row['n6']]
-        for n in nums:
-            last_seen[n] = current_id
-
-    all_numbers = list(range(46)) 
-    
-    # Check numbers never seen
-    never_seen = [n for n in all_numbers if n not in last_seen]
-    
-    # Check numbers seen but long ago
-    seen_list = [(n, last_seen[n]) for n in last_seen]
-    seen_list.sort(key=lambda x: x[1]) # Ascending sort by ID
-    
-    coldest = never_seen + [x[0] for x in seen_list]
-    
-    return coldest[:10]
+    # Never seen (-1) sorts first, then the oldest last-seen draw
+    return np.argsort(stats['ultimo'], kind='stable')[:10].tolist()
 
+@cronometrado
 def get_heatmap_data(modalidad):
     """
     Returns a DataFrame with stats for ALL numbers (0-45).
-    Columns: Numero, Frecuencia, UltimoSorteoId, UltimaFecha
+    Columns: Numero, Frecuencia, UltimoSorteo, FechaUltima, Retraso
     """
-    df = get_data(modalidad)
-    if df.empty:
+    stats = get_stats(modalidad)
+    if stats is None:
         return pd.DataFrame()
 
-    # 1. Calculate Frequency (Total)
-    melted = pd.melt(df, value_vars=['n1', 'n2', 'n3', 'n4', 'n5', 'n6'])
-    freq_counts = melted['value'].value_counts()
-
-    # 2. Calculate Last Seen
-    df_sorted = df.sort_values(by='sorteo_id', ascending=True)
-    last_seen_id = {}
-    last_seen_date = {}
-
-    for _, row in df_sorted.iterrows():
-        draw_id = row['sorteo_id']
-        date_val = row['fecha']
-        nums = [row['n1'], row['n2'], row['n3'], row['n4'], row['n5'], row['n6']]
-        for n in nums:
-            last_seen_id[n] = draw_id
-            last_seen_date[n] = date_val
-
-    # 3. Build Result DataFrame
-    stats = []
-    current_max_id = df['sorteo_id'].max()
-
-    for n in range(46):
-        frec = freq_counts.get(n, 0)
-        l_id = last_seen_id.get(n, -1)
-        l_date = last_seen_date.get(n, "Nunca")
-        
-        # Calculate "Delay" (Retraso)
-        delay = (current_max_id - l_id) if l_id != -1 else 999
-
-        stats.append({
-            'Numero': n,
-            'Frecuencia': frec,
-            'UltimoSorteo': l_id,
-            'FechaUltima': l_date,
-            'Retraso': delay
-        })
-    
-    return pd.DataFrame(stats)
-
+    # The newest draw's numbers carry the modality's max sorteo_id
+    seen = stats['ultimo'] >= 0
+    return pd.DataFrame({
+        'Numero': np.arange(TOTAL_NUMBERS),
+        'Frecuencia': stats['frecuencia'],
+        'UltimoSorteo': stats['ultimo'],
+        'FechaUltima': stats['fecha'],
+        'Retraso': np.where(seen, stats['ultimo'].max() - stats['ultimo'], 999)
+    })
+
+@cronometrado
 def get_prediction(modalidad):
     """
     Generates a prediction: 3 Hot, 2 Cold, 1 Random.
@@ -138,6 +134,58 @@ def get_prediction(modalidad):
         
     return sorted(list(prediction))
 
+def _elegir(candidatos, k, rng):
+    """Per row, marks up to k random columns among the True ones of `candidatos`."""
+    keys = np.where(candidatos, rng.random(candidatos.shape), 2.0)
+    rank = np.argsort(np.argsort(keys, axis=1), axis=1)
+    return (rank < np.asarray(k)[..., None]) & candidatos
+
+@cronometrado
+def generar_tickets(modalidad, n, seed=None, n_hot=3, n_cold=2, chunk=10_000):
+    """
+    Generates up to n unique tickets with the get_prediction recipe, vectorized:
+    n_hot numbers drawn from the hot list, n_cold from the cold list and the
+    rest uniformly from the remaining numbers. Hot and cold lists are computed
+    once; the same seed always gives the same tickets.
+
+    Batches after the first are always `chunk` rows. Generation stops once
+    MAX_RONDAS_VACIAS of them in a row add no new ticket, i.e. when the recipe
+    has (almost surely) no combination left.
+
+    Returns:
+        (k x 6) sorted int array, k < n only when the recipe ran out of unique tickets.
+    """
+    rng = np.random.default_rng(seed)
+    is_hot = np.zeros(TOTAL_NUMBERS, dtype=bool)
+    is_hot[get_hot_numbers(modalidad)] = True
+    is_cold = np.zeros(TOTAL_NUMBERS, dtype=bool)
+    is_cold[get_cold_numbers(modalidad)] = True
+
+    vistos = np.zeros(0, dtype=np.uint64)
+    tickets = []
+    rows = min(chunk, 2 * n + 16)  # Oversample to absorb duplicates
+    vacias = 0
+    while len(vistos) < n and vacias < MAX_RONDAS_VACIAS:
+        ticket = _elegir(np.broadcast_to(is_hot, (rows, TOTAL_NUMBERS)), n_hot, rng)
+        ticket |= _elegir(is_cold & ~ticket, n_cold, rng)
+        ticket |= _elegir(~ticket, 6 - ticket.sum(axis=1), rng)
+
+        numeros = np.nonzero(ticket)[1].reshape(rows, 6)
+        masks = mascaras(numeros)
+        _, first = np.unique(masks, return_index=True)
+        first.sort()
+        first = first[~np.isin(masks[first], vistos)][:n - len(vistos)]
+        # Later rounds only chase the duplicates: full-size batches, so an empty
+        # one means the remaining combinations are rare or there are none
+        rows = chunk
+        if len(first) == 0:
+            vacias += 1
+            continue
+        vacias = 0
+        vistos = np.concatenate([vistos, masks[first]])
+        tickets.append(numeros[first])
+    return np.concatenate(tickets) if tickets else np.zeros((0, 6), dtype=np.int64)
+
 if __name__ == "__main__":
     # verification/test block
     MOD = "TRADICIONAL"
@@ -1,12 +1,28 @@
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import sessionmaker
-from database import engine, Sorteo
+from fastapi.responses import StreamingResponse
 import analisis
-import scrape_quini6
+import historial
+import bitset
+import coocurrencias
+import cache_sorteos
+import database
+import metricas
+import pipeline
+from parser_sorteo import KEYWORDS
+from jobs import JobManager
+from cache_http import ResponseCache
 import pandas as pd
-from typing import List, Dict, Any
+import asyncio
+import json
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+# Databases from before the stats tables get them filled before serving
+database.asegurar_estadisticas()
 
 app = FastAPI(title="QuiniMind API", version="1.0.0")
 
@@ -19,107 +35,200 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-Session = sessionmaker(bind=engine)
+# Latency histograms, SQL counters, GET /metrics and ?profile=1 (with QUINIMIND_PROFILE=1)
+metricas.instalar(app)
+
+# Serialized read responses, dropped whenever a new draw is ingested
+response_cache = ResponseCache()
+
+# Blocking work runs on two bounded pools instead of Starlette's shared one:
+# short DB reads never wait behind heavy pandas/NumPy work
+db_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("QUINIMIND_DB_WORKERS", 8)), thread_name_prefix="db"
+)
+analytics_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("QUINIMIND_ANALYTICS_WORKERS", 2)), thread_name_prefix="analytics"
+)
+
+async def run_in(pool, fn, *args, **kwargs):
+    """Runs a blocking call on `pool` without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(pool, metricas.en_contexto(fn, *args, **kwargs))
+
+@app.on_event("shutdown")
+def shutdown_pools():
+    db_pool.shutdown(wait=False, cancel_futures=True)
+    analytics_pool.shutdown(wait=False, cancel_futures=True)
+
+# Upper bound of /predict/batch
+MAX_BATCH = 100_000
+# Upper bound of the /history page size
+MAX_HISTORY = 1000
+
+# Only one scrape runs per process at a time
+update_jobs = JobManager(pipeline.actualizar)
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"status": "online", "system": "QuiniMind AI"}
 
-@app.get("/update")
-def trigger_update():
-    """Manually triggers the scraper to check for new results."""
-    try:
-        scrape_quini6.main()
-        return {"status": "success", "message": "Database updated successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.post("/update", status_code=202)
+async def trigger_update():
+    """
+    Starts a background check for new results, or joins the one already running.
+    Poll GET /update/{job_id} for its state. The scrape runs on the job
+    manager's own worker, never on the request pools.
+    """
+    job, created = update_jobs.submit()
+    return {**job.to_dict(), "joined": not created}
+
+@app.get("/update/{job_id}")
+async def get_update_status(job_id: str):
+    """Returns state, timings and rows ingested of an update job."""
+    job = update_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job.to_dict()
+
+def _modalidad(modalidad: str = "TRADICIONAL"):
+    """`modalidad` query param of the per-modality endpoints, 422 if unknown."""
+    # Draw, prefix and bitset caches keep one entry per modalidad for good, so junk values must not reach them
+    modalidad = modalidad.upper()
+    if modalidad not in KEYWORDS:
+        raise HTTPException(status_code=422, detail=f"Unknown modalidad, expected one of {list(KEYWORDS)}")
+    return modalidad
 
 @app.get("/latest")
-def get_latest_draw():
+async def get_latest_draw(request: Request):
     """Returns the most recent draw (sorteo) with all modalities."""
-    session = Session()
-    try:
-        # Assuming higher ID is newer. We need to group by ID.
-        latest_id = session.query(Sorteo.sorteo_id).order_by(Sorteo.sorteo_id.desc()).first()
-        
-        if not latest_id:
-            return {"error": "No data found"}
-            
-        sorteo_id = latest_id[0]
-        
-        # Get all entries for this ID (different modalities)
-        draws = session.query(Sorteo).filter(Sorteo.sorteo_id == sorteo_id).all()
-        
-        result = {
-            "id": sorteo_id,
-            "date": draws[0].fecha if draws else "Unknown",
-            "modes": {}
-        }
-        
-        for draw in draws:
-            # Normalize modality name to camelCase key
-            key = "tradicional"
-            if "SEGUNDA" in draw.modalidad.upper(): key = "laSegunda"
-            elif "REVANCHA" in draw.modalidad.upper(): key = "revancha"
-            elif "SIEMPRE" in draw.modalidad.upper(): key = "siempreSale"
-            
-            result["modes"][key] = [draw.n1, draw.n2, draw.n3, draw.n4, draw.n5, draw.n6]
-            
-        return result
-    finally:
-        session.close()
+    return await run_in(
+        db_pool, response_cache.respond,
+        request, lambda: historial.get_latest() or {"error": "No data found"}
+    )
 
 @app.get("/history")
-def get_history(limit: int = 50):
-    """Returns history of draws for statistics."""
-    session = Session()
-    try:
-        # Get distinct draw IDs ordered descending
-        unique_ids = session.query(Sorteo.sorteo_id, Sorteo.fecha).distinct().order_by(Sorteo.sorteo_id.desc()).limit(limit).all()
-        
-        history = []
-        for sid, date in unique_ids:
-            # For stats, we usually aggregate numbers from all modalities or just Tradicional
-            # Let's aggregate all numbers for this draw ID into one flat list for simplicity in this visualizer
-            draws = session.query(Sorteo).filter(Sorteo.sorteo_id == sid).all()
-            all_numbers = []
-            for d in draws:
-                all_numbers.extend([d.n1, d.n2, d.n3, d.n4, d.n5, d.n6])
-            
-            # Remove duplicates if any (unlikely across modalities but possible)
-            # Actually for frequency stats we keep them all.
-            # But for "numbers" display we might want a representative set? 
-            # The User's React code expects `numbers: [...]` (Array of 6).
-            # It seems the mockup history was just random 6 numbers.
-            # Let's return just the Tradicional numbers as the "representative" set for the history list view.
-            trad = next((d for d in draws if "TRADICIONAL" in d.modalidad.upper()), None)
-            if trad:
-                nums = [trad.n1, trad.n2, trad.n3, trad.n4, trad.n5, trad.n6]
-            else:
-                nums = all_numbers[:6] # Fallback
-                
-            history.append({
-                "id": sid,
-                "date": date,
-                "numbers": nums
-            })
-            
-        return history
-    finally:
-        session.close()
+async def get_history(
+    request: Request,
+    limit: int = Query(50, ge=1, le=MAX_HISTORY),
+    before_id: Optional[int] = None,
+):
+    """
+    Returns history of draws for statistics.
+    Pass the last id of a page as `before_id` to fetch the next (older) page.
+    """
+    return await run_in(
+        db_pool, response_cache.respond,
+        request, lambda: historial.get_history(limit=limit, before_id=before_id)
+    )
 
 @app.get("/stats/heatmap")
-def get_heatmap(modalidad: str = "TRADICIONAL"):
+async def get_heatmap(request: Request, modalidad: str = Depends(_modalidad)):
     """Returns heatmap data."""
-    df = analisis.get_heatmap_data(modalidad.upper())
-    if df.empty:
-        return []
-    return df.to_dict(orient="records")
+    def build():
+        df = analisis.get_heatmap_data(modalidad)
+        return [] if df.empty else df.to_dict(orient="records")
+    return await run_in(analytics_pool, response_cache.respond, request, build)
+
+def _parse_numbers(numbers, min_len, max_len):
+    try:
+        return bitset.validar_numeros(numbers.split(","), min_len, max_len)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/stats/ticket")
+async def get_ticket_stats(request: Request, numbers: str, modalidad: str = Depends(_modalidad)):
+    """
+    How a ticket (comma separated numbers) would have done historically:
+    draws sharing 0..6 numbers with it and the draws that match it exactly.
+    """
+    nums = _parse_numbers(numbers, 1, 6)
+    def build():
+        store = bitset.get_store(modalidad)
+        return {
+            "numbers": sorted(nums),
+            "draws": len(store),
+            "overlap_histogram": store.overlap_histogram(nums).tolist(),
+            "exact_matches": store.ids_exactos(nums).tolist() if len(nums) == 6 else [],
+        }
+    return await run_in(analytics_pool, response_cache.respond, request, build)
+
+@app.get("/stats/together")
+async def get_together(request: Request, numbers: str, modalidad: str = Depends(_modalidad)):
+    """How many draws contain all the given numbers (a pair or a triple) and which ones."""
+    nums = _parse_numbers(numbers, 2, 3)
+    def build():
+        count, ids = bitset.get_store(modalidad).co_ocurrencias(nums)
+        return {"numbers": sorted(nums), "count": count, "ids": ids.tolist()}
+    return await run_in(analytics_pool, response_cache.respond, request, build)
+
+@app.get("/stats/window")
+async def get_window(
+    request: Request,
+    modalidad: str = Depends(_modalidad),
+    desde: Optional[int] = Query(None, alias="from"),
+    hasta: Optional[int] = Query(None, alias="to"),
+):
+    """Frequency of every number between two sorteo ids (both inclusive)."""
+    return await run_in(
+        analytics_pool, response_cache.respond,
+        request, lambda: analisis.get_window_counts(modalidad, desde, hasta)
+    )
+
+@app.get("/stats/pairs")
+async def get_pairs(
+    request: Request,
+    modalidad: str = Depends(_modalidad),
+    k: int = Query(20, ge=1, le=1035),
+    number: Optional[int] = None,
+):
+    """Top-k pairs of numbers that came out together, optionally involving `number`."""
+    return await run_in(
+        db_pool, response_cache.respond,
+        request, lambda: coocurrencias.top_pares(modalidad, k, number)
+    )
+
+@app.get("/stats/triples")
+async def get_triples(
+    request: Request,
+    modalidad: str = Depends(_modalidad),
+    k: int = Query(20, ge=1, le=1000),
+    number: Optional[int] = None,
+):
+    """Top-k triples of numbers that came out together, optionally involving `number`."""
+    return await run_in(
+        db_pool, response_cache.respond,
+        request, lambda: coocurrencias.top_ternas(modalidad, k, number)
+    )
+
+@app.get("/stats/cache")
+async def get_cache_stats():
+    """Returns hit/miss counters of the in-process draw and response caches."""
+    return {"draws": cache_sorteos.cache.stats(), "responses": response_cache.stats()}
 
 @app.get("/predict")
-def get_prediction(modalidad: str = "TRADICIONAL"):
-    """Generates a prediction."""
-    return analisis.get_prediction(modalidad.upper())
+async def get_prediction(modalidad: str = Depends(_modalidad)):
+    """Generates a prediction (random part included, so it is never cached)."""
+    return await run_in(analytics_pool, analisis.get_prediction, modalidad)
+
+@app.get("/predict/batch")
+async def get_prediction_batch(
+    n: int = Query(10, ge=1, le=MAX_BATCH),
+    modalidad: str = Depends(_modalidad),
+    seed: Optional[int] = Query(None, ge=0),
+):
+    """
+    N unique predictions in one call, streamed as NDJSON (one ticket per line).
+    The seed used is returned in X-Seed, so any batch can be reproduced.
+    """
+    if seed is None:
+        seed = secrets.randbits(32)
+    tickets = await run_in(analytics_pool, analisis.generar_tickets, modalidad, n, seed)
+
+    def lines():
+        for start in range(0, len(tickets), 1000):
+            yield "".join(json.dumps(t) + "\n" for t in tickets[start:start + 1000].tolist())
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson",
+                             headers={"X-Seed": str(seed), "X-Count": str(len(tickets))})
 
 if __name__ == "__main__":
     import uvicorn
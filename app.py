@@ -5,9 +5,10 @@ import plotly.graph_objects as go
 import random
 import time
 import numpy as np
-import scrape_quini6
+import pipeline
 import analisis
-from database import engine
+import bitset
+import database
 
 # ------------------------------------------------------
 # 1. CONFIGURACIÓN Y ESTILOS CSS MEJORADOS (V2)
@@ -118,61 +119,56 @@ st.markdown("""
 # 2. FUNCIONES (MOCKUP MEJORADO -> INTEGRACIÓN REAL)
 # ------------------------------------------------------
 
-# --- Sidebar Control for DB Update ---
-with st.sidebar:
-    st.header("⚙️ Admin")
-    if st.button("🔄 Sincronizar DB", use_container_width=True):
-        with st.spinner("Conectando al servidor..."):
-            try:
-                scrape_quini6.main()
-                st.success("¡Datos Actualizados!")
-                time.sleep(1)
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error: {e}")
+# --- Capa de datos cacheada ---
+# Todo se cachea por versión de datos (max sorteo_id, filas): un sorteo nuevo invalida solo.
 
-# ------------------------------------------------------
-# 3. INTERFAZ PRINCIPAL V2
-# ------------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def preparar_base():
+    """Una vez por proceso: llena las estadísticas de bases anteriores a esas tablas."""
+    database.asegurar_estadisticas()
 
-# Header con Glow
-col1, col2 = st.columns([3, 1])
-with col1:
-    st.markdown('<h1>💎 QUINIMIND <span style="color:#00d4ff">ELITE</span></h1>', unsafe_allow_html=True)
-    st.markdown('<p style="color:#B0B0B0; font-size:1.1rem;">Inteligencia Artificial Predictiva v2.1 (Live Data)</p>', unsafe_allow_html=True)
-with col2:
-    st.markdown('<div style="text-align: right; padding-top: 20px;"><span style="background-color: #00ff00; box-shadow: 0 0 10px #00ff00; border-radius: 50%; display: inline-block; width: 10px; height: 10px; margin-right: 8px;"></span><span style="color:white; font-weight:bold;">SISTEMA ONLINE</span></div>', unsafe_allow_html=True)
+preparar_base()
 
-st.divider()
+@st.cache_data(ttl=10, show_spinner=False)
+def version_datos():
+    return database.data_version()
 
-# --- SECCIÓN 1: EL TABLERO TÉRMICO NEÓN ---
-st.markdown('<div class="glass-card"><h3>🔥 Mapa Térmico de Frecuencias (Histórico)</h3>', unsafe_allow_html=True)
-st.markdown('<p style="color:#E0E0E0">Análisis visual del comportamiento histórico de las bolillas en base a datos reales.</p>', unsafe_allow_html=True)
+@st.cache_data(show_spinner=False)
+def cargar_heatmap(modalidad, version):
+    return analisis.get_heatmap_data(modalidad)
 
-# Selectbox para el Heatmap (usando el estilo corregido)
-heatmap_modalidad = st.selectbox("Seleccionar Modalidad de Análisis:", ["TRADICIONAL", "LA SEGUNDA", "REVANCHA", "SIEMPRE SALE"])
+@st.cache_data(show_spinner=False)
+def cargar_tendencias(modalidad, version):
+    return analisis.get_hot_numbers(modalidad), analisis.get_cold_numbers(modalidad)
 
-# DATOS REALES
-df_freq = analisis.get_heatmap_data(heatmap_modalidad)
-
-if not df_freq.empty:
-    z_values = np.full((5, 10), np.nan)
-    text_values = np.full((5, 10), "", dtype=object)
-    hover_text = np.full((5, 10), "", dtype=object)
-
-    for index, row in df_freq.iterrows():
-        num = int(row['Numero'])
-        freq = int(row['Frecuencia'])
-        delay = int(row['Retraso'])
-        
-        r = num // 10
-        c = num % 10
-        if r < 5:
-            num_str = str(num).zfill(2)
-            z_values[r][c] = freq
-            text_values[r][c] = num_str
-            status = "ARDIEENDO 🔥" if freq > 10 else ("CONGELADO ❄️" if delay > 20 else "Normal")
-            hover_text[r][c] = f"Bolilla: {num_str}<br>Frecuencia: {freq}<br>Retraso: {delay}<br>Estado: {status}"
+def grilla_heatmap(df_freq):
+    """Arma la grilla 5x10 (bolilla = fila*10 + columna) sin recorrer filas."""
+    nums = df_freq['Numero'].to_numpy(dtype=int)
+    freq = df_freq['Frecuencia'].to_numpy(dtype=int)
+    delay = df_freq['Retraso'].to_numpy(dtype=int)
+    keep = nums < 50
+    nums, freq, delay = nums[keep], freq[keep], delay[keep]
+
+    num_str = np.char.zfill(nums.astype(str), 2)
+    status = np.where(freq > 10, "ARDIEENDO 🔥", np.where(delay > 20, "CONGELADO ❄️", "Normal"))
+    hover = [f"Bolilla: {n}<br>Frecuencia: {f}<br>Retraso: {d}<br>Estado: {e}"
+             for n, f, d, e in zip(num_str, freq, delay, status)]
+
+    z_values = np.full(50, np.nan)
+    text_values = np.full(50, "", dtype=object)
+    hover_text = np.full(50, "", dtype=object)
+    z_values[nums] = freq
+    text_values[nums] = num_str
+    hover_text[nums] = hover
+    return z_values.reshape(5, 10), text_values.reshape(5, 10), hover_text.reshape(5, 10)
+
+@st.cache_resource(show_spinner=False)
+def figura_heatmap(modalidad, version):
+    """Figura Plotly compartida entre sesiones (no se modifica al renderizar)."""
+    df_freq = cargar_heatmap(modalidad, version)
+    if df_freq.empty:
+        return None
+    z_values, text_values, hover_text = grilla_heatmap(df_freq)
 
     # Crear gráfico Plotly con NUEVA ESCALA DE COLOR VIBRANTE
     fig = go.Figure(data=go.Heatmap(
@@ -206,7 +202,51 @@ if not df_freq.empty:
         xaxis=dict(showticklabels=False, showgrid=False, fixedrange=True),
         yaxis=dict(showticklabels=False, showgrid=False, autorange="reversed", fixedrange=True)
     )
+    return fig
+
+# --- Sidebar Control for DB Update ---
+with st.sidebar:
+    st.header("⚙️ Admin")
+    if st.button("🔄 Sincronizar DB", use_container_width=True):
+        with st.spinner("Conectando al servidor..."):
+            try:
+                result = pipeline.actualizar()
+                if result["status"] == "unchanged":
+                    st.info(f"Sin novedades: el sorteo {result['sorteo_id']} ya estaba cargado.")
+                else:
+                    st.success("¡Datos Actualizados!")
+                version_datos.clear()
+                time.sleep(1)
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error: {e}")
 
+# ------------------------------------------------------
+# 3. INTERFAZ PRINCIPAL V2
+# ------------------------------------------------------
+
+# Header con Glow
+col1, col2 = st.columns([3, 1])
+with col1:
+    st.markdown('<h1>💎 QUINIMIND <span style="color:#00d4ff">ELITE</span></h1>', unsafe_allow_html=True)
+    st.markdown('<p style="color:#B0B0B0; font-size:1.1rem;">Inteligencia Artificial Predictiva v2.1 (Live Data)</p>', unsafe_allow_html=True)
+with col2:
+    st.markdown('<div style="text-align: right; padding-top: 20px;"><span style="background-color: #00ff00; box-shadow: 0 0 10px #00ff00; border-radius: 50%; display: inline-block; width: 10px; height: 10px; margin-right: 8px;"></span><span style="color:white; font-weight:bold;">SISTEMA ONLINE</span></div>', unsafe_allow_html=True)
+
+st.divider()
+
+# --- SECCIÓN 1: EL TABLERO TÉRMICO NEÓN ---
+st.markdown('<div class="glass-card"><h3>🔥 Mapa Térmico de Frecuencias (Histórico)</h3>', unsafe_allow_html=True)
+st.markdown('<p style="color:#E0E0E0">Análisis visual del comportamiento histórico de las bolillas en base a datos reales.</p>', unsafe_allow_html=True)
+
+# Selectbox para el Heatmap (usando el estilo corregido)
+heatmap_modalidad = st.selectbox("Seleccionar Modalidad de Análisis:", ["TRADICIONAL", "LA SEGUNDA", "REVANCHA", "SIEMPRE SALE"])
+
+# DATOS REALES
+version = version_datos()
+fig = figura_heatmap(heatmap_modalidad, version)
+
+if fig is not None:
     st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
 else:
     st.warning("No hay datos disponibles. Por favor actualiza la base de datos.")
@@ -232,14 +272,6 @@ with col_pred:
     # BOTÓN "RADIOACTIVO"
     if st.button("⚡ INVOCAR JUGADA MAESTRA ⚡", type="primary", use_container_width=True):
         with st.spinner("Iniciando secuencia de cálculo probabilístico..."):
-            # Simulación de proceso
-            progress_bar = st.progress(0)
-            for i in range(100):
-                time.sleep(0.015)
-                progress_bar.progress(i + 1)
-            time.sleep(0.5)
-            progress_bar.empty()
-            
             # Generar números REALES
             try:
                 nums = analisis.get_prediction(pred_modalidad)
@@ -259,6 +291,13 @@ with col_pred:
                         <span style="color:white;">La combinación maximiza la varianza entre decenas y respeta la Ley del Retraso actual.</span>
                     </div>
                 """, unsafe_allow_html=True)
+
+                # Cómo le habría ido a esta jugada en todo el historial
+                store = bitset.get_store(pred_modalidad)
+                hist = store.overlap_histogram(nums)
+                mejor = int(np.flatnonzero(hist)[-1]) if hist.any() else 0
+                ya_salio = "ya salió completa" if store.ha_salido(nums) else "nunca salió completa"
+                st.caption(f"Historial: mejor coincidencia {mejor} aciertos · {int(hist[3:].sum())} sorteos con 3+ aciertos · {ya_salio}")
             except Exception as e:
                 st.error("Error al generar predicción. Verifica los datos.")
             
@@ -270,8 +309,7 @@ with col_stats:
     st.markdown('<p style="color:#E0E0E0; margin-bottom:25px;">Datos en tiempo real del motor estadístico.</p>', unsafe_allow_html=True)
     
     # Obtener métricas reales
-    hot_now = analisis.get_hot_numbers(heatmap_modalidad)
-    cold_now = analisis.get_cold_numbers(heatmap_modalidad)
+    hot_now, cold_now = cargar_tendencias(heatmap_modalidad, version)
     
     val_hot = hot_now[0] if hot_now else "-"
     val_cold = cold_now[0] if cold_now else "-"
@@ -0,0 +1,251 @@
+import argparse
+import functools
+import http.server
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+import scrape_quini6
+from database import cerrar, engine, guardar_sorteos_bulk
+
+# Página de cada sorteo: /quini6/sorteo-<id>-del-dia-<dd-mm-yyyy>.htm
+SORTEO_PATH = "quini6/sorteo-{id}-del-dia-{fecha}.htm"
+
+# El Quini 6 se sortea miércoles (2) y domingos (6)
+DIAS_SORTEO = (2, 6)
+
+# Si la fecha estimada da 404 se prueban los días vecinos (feriados, cambios de calendario)
+DESVIOS_FECHA = (0, -1, 1, -2, 2, -3, 3)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class RateLimiter:
+    """Deja pasar como máximo `por_segundo` requests, compartido entre threads."""
+
+    def __init__(self, por_segundo):
+        self.intervalo = 1.0 / por_segundo if por_segundo > 0 else 0.0
+        self._lock = threading.Lock()
+        self._proximo = 0.0
+
+    def esperar(self):
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._proximo)
+            self._proximo = turno + self.intervalo
+        if turno > ahora:
+            time.sleep(turno - ahora)
+
+def url_sorteo(base_url, sorteo_id, fecha):
+    return base_url.rstrip('/') + '/' + SORTEO_PATH.format(id=sorteo_id, fecha=fecha.strftime("%d-%m-%Y"))
+
+def estimar_fecha(ancla_id, ancla_fecha, sorteo_id):
+    """
+    Estima la fecha de `sorteo_id` caminando el calendario de sorteos
+    (miércoles y domingo) desde un sorteo conocido.
+    """
+    fecha = ancla_fecha
+    paso = 1 if sorteo_id >= ancla_id else -1
+    for _ in range(abs(sorteo_id - ancla_id)):
+        fecha += timedelta(days=paso)
+        while fecha.weekday() not in DIAS_SORTEO:
+            fecha += timedelta(days=paso)
+    return fecha
+
+class Backfill:
+    """
+    Recorre un rango de sorteos con concurrencia acotada sobre una sesión HTTP
+    compartida, y guarda cada sorteo parseado en la base.
+
+    Las fechas reales que se van descubriendo se usan como anclas para estimar
+    la URL de los sorteos siguientes.
+    """
+
+    def __init__(self, base_url=scrape_quini6.URL, concurrencia=4, por_segundo=2.0,
+                 reintentos=4, backoff=1.0, batch_size=200, session=None):
+        self.base_url = base_url
+        self.concurrencia = concurrencia
+        self.reintentos = reintentos
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.limiter = RateLimiter(por_segundo)
+        self.session = session or scrape_quini6.crear_sesion(pool_size=concurrencia)
+        self._anclas = {}
+        self._anclas_lock = threading.Lock()
+
+    def agregar_ancla(self, sorteo_id, fecha):
+        with self._anclas_lock:
+            self._anclas[sorteo_id] = fecha
+
+    def _ancla_cercana(self, sorteo_id):
+        with self._anclas_lock:
+            return min(self._anclas.items(), key=lambda item: abs(item[0] - sorteo_id))
+
+    def _get(self, url):
+        """GET con rate limit y reintentos con backoff exponencial. Devuelve None en 404."""
+        for intento in range(self.reintentos + 1):
+            self.limiter.esperar()
+            try:
+                response = self.session.get(url, timeout=20)
+            except Exception:
+                if intento == self.reintentos:
+                    raise
+            else:
+                if response.status_code == 404:
+                    return None
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.content
+                if intento == self.reintentos:
+                    response.raise_for_status()
+            time.sleep(self.backoff * (2 ** intento) * (1 + random.random() * 0.25))
+
+    def descargar(self, sorteo_id):
+        """Busca y parsea la página de un sorteo. Devuelve el JSON del sorteo o None."""
+        ancla_id, ancla_fecha = self._ancla_cercana(sorteo_id)
+        estimada = estimar_fecha(ancla_id, ancla_fecha, sorteo_id)
+        for desvio in DESVIOS_FECHA:
+            fecha = estimada + timedelta(days=desvio)
+            html = self._get(url_sorteo(self.base_url, sorteo_id, fecha))
+            if html is None:
+                continue
+            data = scrape_quini6.parsear_sorteo(html)
+            # La URL que respondió confirma el id y la fecha real del sorteo
+            # (la página puede no traer fecha y el parser caería en la de hoy)
+            data["id"] = sorteo_id
+            data["date"] = fecha.strftime("%d/%m/%Y")
+            self.agregar_ancla(sorteo_id, fecha)
+            return data
+        return None
+
+    def ejecutar(self, desde, hasta, existentes=()):
+        """
+        Descarga los sorteos [desde, hasta] que no estén en `existentes`.
+
+        Returns:
+            dict: draws fetched, missing (404 en todas las fechas), failed,
+            plus the inserted/skipped row counts of the DB.
+        """
+        existentes = set(existentes)
+        pendientes = [sid for sid in range(desde, hasta + 1) if sid not in existentes]
+        resumen = {"fetched": 0, "missing": [], "failed": [], "inserted": 0, "skipped": 0}
+
+        def descargados(pool):
+            futures = {pool.submit(self.descargar, sid): sid for sid in pendientes}
+            for future in as_completed(futures):
+                sid = futures[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    print(f"❌ Sorteo {sid}: {e}")
+                    resumen["failed"].append(sid)
+                    continue
+                if data is None:
+                    resumen["missing"].append(sid)
+                    continue
+                resumen["fetched"] += 1
+                yield from scrape_quini6.filas_db(data)
+
+        # Un solo guardado para todo el rango: las filas se insertan de a
+        # batch_size a medida que llegan y las estadísticas se recalculan una vez
+        with ThreadPoolExecutor(max_workers=self.concurrencia) as pool:
+            result = guardar_sorteos_bulk(descargados(pool), batch_size=self.batch_size)
+        resumen["inserted"] = result["inserted"]
+        resumen["skipped"] = result["skipped"]
+
+        resumen["missing"].sort()
+        resumen["failed"].sort()
+        return resumen
+
+def ultimo_guardado():
+    """(sorteo_id, fecha) del sorteo más reciente en la base, o None."""
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT sorteo_id, fecha_date FROM sorteos WHERE fecha_date IS NOT NULL "
+                 "ORDER BY sorteo_id DESC LIMIT 1")
+        ).first()
+    if not row:
+        return None
+    return row[0], date.fromisoformat(row[1])
+
+def ids_guardados(desde, hasta):
+    """Ids de sorteo ya guardados en el rango (con al menos una modalidad)."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT DISTINCT sorteo_id FROM sorteos WHERE sorteo_id BETWEEN :a AND :b"),
+            {"a": desde, "b": hasta}
+        )
+        return {r[0] for r in rows}
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+@contextmanager
+def servidor_fixtures(directorio, port=0):
+    """
+    Servidor HTTP local que sirve páginas HTML guardadas, para probar el
+    backfill sin red. Los archivos siguen la ruta del sitio real, por ejemplo
+    <directorio>/quini6/sorteo-3330-del-dia-14-12-2025.htm
+
+    Yields:
+        str: base URL a pasar como `base_url`.
+    """
+    handler = functools.partial(_QuietHandler, directory=directorio)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill histórico de sorteos del Quini 6")
+    parser.add_argument("--desde", type=int, help="Primer sorteo (default: el siguiente al último guardado)")
+    parser.add_argument("--hasta", type=int, required=True, help="Último sorteo a descargar")
+    parser.add_argument("--ancla", help="Sorteo conocido como ID:dd/mm/yyyy si la base está vacía")
+    parser.add_argument("--concurrencia", type=int, default=4)
+    parser.add_argument("--por-segundo", type=float, default=2.0, help="Máximo de requests por segundo")
+    parser.add_argument("--reintentos", type=int, default=4)
+    parser.add_argument("--fixtures", help="Directorio de HTML guardados a servir localmente en vez del sitio real")
+    args = parser.parse_args(argv)
+
+    ultimo = ultimo_guardado()
+    if args.ancla:
+        sid, fecha = args.ancla.split(":")
+        ancla = (int(sid), datetime.strptime(fecha, "%d/%m/%Y").date())
+    elif ultimo:
+        ancla = ultimo
+    else:
+        parser.error("La base está vacía: indicá un --ancla ID:dd/mm/yyyy")
+
+    desde = args.desde if args.desde is not None else (ultimo[0] + 1 if ultimo else ancla[0])
+
+    def correr(base_url):
+        backfill = Backfill(base_url, concurrencia=args.concurrencia,
+                            por_segundo=args.por_segundo, reintentos=args.reintentos)
+        backfill.agregar_ancla(*ancla)
+        print(f"⚡ Backfill de sorteos {desde}..{args.hasta} desde {base_url}")
+        return backfill.ejecutar(desde, args.hasta, existentes=ids_guardados(desde, args.hasta))
+
+    if args.fixtures:
+        with servidor_fixtures(args.fixtures) as base_url:
+            resumen = correr(base_url)
+    else:
+        resumen = correr(scrape_quini6.URL)
+
+    print(f"✅ {resumen['fetched']} sorteos descargados, {resumen['inserted']} filas nuevas, "
+          f"{resumen['skipped']} repetidas")
+    if resumen["missing"]:
+        print(f"⚠️ Sin página: {resumen['missing']}")
+    if resumen["failed"]:
+        print(f"❌ Con error: {resumen['failed']}")
+    cerrar()
+    return 1 if resumen["failed"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import numpy as np
+import columnar
+from bitset import mascaras, popcount
+from cache_sorteos import get_draws
+from database import TOTAL_NUMBERS
+from parser_sorteo import KEYWORDS
+from ventanas import one_hot, prefix_sums
+
+MODALIDADES = list(KEYWORDS)
+BASELINE_CHUNK = 250_000
+
+def walk_forward_inputs(onehot, last_n):
+    """
+    For every draw t, the inputs a strategy may see using only draws < t:
+    appearances in the previous `last_n` draws and the index of the last
+    appearance (-1 if never).
+    """
+    total = len(onehot)
+    prefix = prefix_sums(onehot)
+    t = np.arange(total)
+    ventana = prefix[t] - prefix[np.maximum(t - last_n, 0)]
+
+    seen_at = np.where(onehot, t[:, None], -1)
+    last_seen = np.full((total, TOTAL_NUMBERS), -1, dtype=np.int64)
+    last_seen[1:] = np.maximum.accumulate(seen_at, axis=0)[:-1]
+    return ventana, last_seen
+
+def tickets_hot_cold(ventana, last_seen, n_hot, n_cold, rng):
+    """
+    Vectorized analisis.get_prediction for every row: n_hot most frequent
+    (count > 0), then n_cold coldest, then random numbers up to 6.
+
+    Returns:
+        (rows x 46) boolean ticket matrix.
+    """
+    rows = np.arange(len(ventana))[:, None]
+    numeros = np.arange(TOTAL_NUMBERS)
+    ticket = np.zeros(ventana.shape, dtype=bool)
+
+    if n_hot:
+        # Ties broken by the smaller number, like a stable sort
+        hot_key = ventana.astype(np.int64) * 64 + (63 - numeros)
+        hot = np.argsort(-hot_key, axis=1)[:, :n_hot]
+        ticket[rows, hot] = np.take_along_axis(ventana, hot, axis=1) > 0
+
+    if n_cold:
+        cold_key = last_seen * 64 + numeros
+        cold_key[ticket] = np.iinfo(np.int64).max
+        cold = np.argsort(cold_key, axis=1)[:, :n_cold]
+        ticket[rows, cold] = True
+
+    faltan = 6 - ticket.sum(axis=1)
+    azar = rng.random(ticket.shape)
+    azar[ticket] = 2.0
+    rank = np.argsort(np.argsort(azar, axis=1), axis=1)
+    ticket |= rank < faltan[:, None]
+    return ticket
+
+def hits_histogram(aciertos):
+    return np.bincount(aciertos, minlength=7)[:7]
+
+def evaluar_estrategia(numeros, last_n, n_hot, n_cold, warmup, seed):
+    """Replays one strategy over a modality's history. Returns its hit stats."""
+    onehot = one_hot(numeros)
+    ventana, last_seen = walk_forward_inputs(onehot, last_n)
+    rng = np.random.default_rng(seed)
+    ticket = tickets_hot_cold(ventana[warmup:], last_seen[warmup:], n_hot, n_cold, rng)
+    aciertos = (ticket & onehot[warmup:]).sum(axis=1)
+    return _resumen(aciertos, {"last_n": last_n, "hot": n_hot, "cold": n_cold})
+
+def baseline_aleatorio(numeros, n_tickets, warmup, seed):
+    """
+    Hits of `n_tickets` uniformly random tickets, each against a random draw of
+    the evaluated range, as uint64 masks + popcount, in chunks to bound memory.
+    """
+    draw_masks = mascaras(numeros[warmup:])
+    rng = np.random.default_rng(seed)
+    hist = np.zeros(7, dtype=np.int64)
+    restantes = n_tickets
+    while restantes > 0:
+        chunk = min(restantes, BASELINE_CHUNK)
+        elegidos = np.argpartition(rng.random((chunk, TOTAL_NUMBERS)), 6, axis=1)[:, :6]
+        sorteos = draw_masks[rng.integers(0, len(draw_masks), size=chunk)]
+        hist += hits_histogram(popcount(mascaras(elegidos) & sorteos))
+        restantes -= chunk
+    return _resumen_hist(hist, {"strategy": "random"})
+
+def _resumen(aciertos, params):
+    return _resumen_hist(hits_histogram(aciertos), params)
+
+def _resumen_hist(hist, params):
+    total = int(hist.sum())
+    return {
+        **params,
+        "tickets": total,
+        "hits": hist.tolist(),
+        "mean_hits": float(hist @ np.arange(7) / total) if total else 0.0,
+        "rate_3plus": float(hist[3:].sum() / total) if total else 0.0,
+    }
+
+def _job(args):
+    kind, modalidad, numeros, params = args
+    if isinstance(numeros, str):
+        # Columnar directory: each worker maps the same page-cached file instead of unpickling a copy
+        numeros = columnar.cargar(modalidad, numeros).numeros
+    if kind == "baseline":
+        return modalidad, baseline_aleatorio(numeros, **params)
+    return modalidad, evaluar_estrategia(numeros, **params)
+
+def backtest(modalidades=MODALIDADES, last_ns=(50,), mixes=((3, 2),),
+             baseline_tickets=1_000_000, workers=None, seed=0, columnar_dir=None):
+    """
+    Walk-forward backtest of hot/cold strategies over a parameter grid,
+    plus a random-ticket baseline, for each modality. Grid points run in
+    parallel processes. With `columnar_dir` the draws are memory-mapped
+    from the columnar files (see columnar.py) rather than read from the DB.
+
+    Returns:
+        dict: modalidad -> {"strategies": [...], "baseline": {...}}
+    """
+    warmup = max(last_ns)
+    jobs = []
+    for modalidad in modalidades:
+        if columnar_dir:
+            meta = columnar.leer_meta(columnar_dir, modalidad)
+            total, numeros = (meta["rows"] if meta else 0), columnar_dir
+        else:
+            numeros = np.asarray(get_draws(modalidad).numeros)
+            total = len(numeros)
+        if total <= warmup:
+            continue
+        for i, (last_n, (n_hot, n_cold)) in enumerate(product(last_ns, mixes)):
+            params = {"last_n": last_n, "n_hot": n_hot, "n_cold": n_cold,
+                      "warmup": warmup, "seed": [seed, 1, i]}
+            jobs.append(("strategy", modalidad, numeros, params))
+        if baseline_tickets:
+            params = {"n_tickets": baseline_tickets, "warmup": warmup, "seed": [seed, 0]}
+            jobs.append(("baseline", modalidad, numeros, params))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for modalidad, res in pool.map(_job, jobs):
+            entry = results.setdefault(modalidad, {"strategies": [], "baseline": None})
+            if res.get("strategy") == "random":
+                entry["baseline"] = res
+            else:
+                entry["strategies"].append(res)
+    return results
+
+def _parse_mix(texto):
+    hot, cold = (int(x) for x in texto.split(":"))
+    if hot + cold > 6:
+        raise argparse.ArgumentTypeError("hot + cold must be <= 6")
+    return hot, cold
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the hot/cold prediction strategy")
+    parser.add_argument("--modalidad", action="append", help="Repeat for several (default: all)")
+    parser.add_argument("--last-n", type=int, nargs="+", default=[50])
+    parser.add_argument("--mix", type=_parse_mix, nargs="+", default=[(3, 2)], help="HOT:COLD, e.g. 3:2 4:1")
+    parser.add_argument("--baseline", type=int, default=1_000_000, help="Random tickets for the baseline")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the full results to this file")
+    parser.add_argument("--columnar", metavar="DIR", help="Read draws from the columnar files in DIR")
+    args = parser.parse_args(argv)
+
+    modalidades = [m.upper() for m in args.modalidad] if args.modalidad else MODALIDADES
+    results = backtest(modalidades, args.last_n, args.mix, args.baseline, args.workers, args.seed,
+                       columnar_dir=args.columnar)
+
+    for modalidad, entry in results.items():
+        print(f"--- {modalidad} ---")
+        base = entry["baseline"]
+        if base:
+            print(f"{'random':>18s}  mean {base['mean_hits']:.4f}  3+ {base['rate_3plus']:.4%}  ({base['tickets']} tickets)")
+        for res in sorted(entry["strategies"], key=lambda r: -r["mean_hits"]):
+            label = f"n={res['last_n']} {res['hot']}h/{res['cold']}c"
+            print(f"{label:>18s}  mean {res['mean_hits']:.4f}  3+ {res['rate_3plus']:.4%}  hits {res['hits']}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
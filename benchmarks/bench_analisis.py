@@ -0,0 +1,81 @@
+"""
+Microbenchmark: the heatmap and cold numbers served from the estadisticas
+table (what the API runs) vs the old iterrows loops over the whole history.
+
+Usage: python -m benchmarks.bench_analisis [n_draws]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.sintetico import generar_sorteos
+
+def legacy_heatmap(df):
+    """The pre-vectorization implementation, kept for comparison."""
+    melted = pd.melt(df, value_vars=['n1', 'n2', 'n3', 'n4', 'n5', 'n6'])
+    freq_counts = melted['value'].value_counts()
+    last_seen_id = {}
+    last_seen_date = {}
+    for _, row in df.sort_values(by='sorteo_id', ascending=True).iterrows():
+        for n in [row['n1'], row['n2'], row['n3'], row['n4'], row['n5'], row['n6']]:
+            last_seen_id[n] = row['sorteo_id']
+            last_seen_date[n] = row['fecha']
+    current_max_id = df['sorteo_id'].max()
+    stats = []
+    for n in range(46):
+        l_id = last_seen_id.get(n, -1)
+        stats.append({
+            'Numero': n,
+            'Frecuencia': freq_counts.get(n, 0),
+            'UltimoSorteo': l_id,
+            'FechaUltima': last_seen_date.get(n, "Nunca"),
+            'Retraso': (current_max_id - l_id) if l_id != -1 else 999
+        })
+    return pd.DataFrame(stats)
+
+def timeit(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+def correr(n_draws):
+    import analisis
+    import database
+
+    df = generar_sorteos(n_draws)
+    print(f"--- {n_draws} synthetic draws ---")
+    database.init_db()
+    t0 = time.perf_counter()
+    database.guardar_sorteos_bulk(database.filas_dataframe(df), batch_size=5000)
+    print(f"ingest + estadisticas rebuild: {(time.perf_counter() - t0) * 1000:9.1f} ms")
+
+    t_old, old = timeit(legacy_heatmap, df, repeat=1)
+    t_new, new = timeit(analisis.get_heatmap_data, "TRADICIONAL")
+    cols = ['Numero', 'Frecuencia', 'UltimoSorteo', 'FechaUltima', 'Retraso']
+    assert old[cols].to_numpy().tolist() == new[cols].to_numpy().tolist(), "results differ"
+    print(f"heatmap  legacy: {t_old * 1000:9.1f} ms   estadisticas: {t_new * 1000:7.1f} ms   x{t_old / t_new:.0f}")
+
+    t_cold, cold = timeit(analisis.get_cold_numbers, "TRADICIONAL")
+    legacy_cold = np.argsort(old['UltimoSorteo'].to_numpy(), kind='stable')[:10].tolist()
+    assert cold == legacy_cold, "cold numbers differ"
+    print(f"cold     estadisticas: {t_cold * 1000:7.1f} ms")
+
+def main(n_draws=100_000):
+    tmpdir = tempfile.mkdtemp(prefix="quinimind-bench-")
+    # Must be set before database.py is first imported, it creates the engine at import time
+    os.environ["QUINIMIND_DB_URL"] = "sqlite:///" + os.path.join(tmpdir, "bench.db")
+    try:
+        correr(n_draws)
+    finally:
+        import database
+        database.cerrar()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
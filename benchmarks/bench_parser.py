@@ -0,0 +1,82 @@
+"""
+Benchmark and correctness check of parser_sorteo against the old
+BeautifulSoup `next_elements` parser, over saved HTML pages.
+
+Usage: python -m benchmarks.bench_parser [fixtures_dir] [repeat]
+
+fixtures_dir defaults to tests/fixtures.
+"""
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from bs4 import BeautifulSoup
+import parser_sorteo
+from parser_sorteo import KEYWORDS
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+def legacy_parse(html):
+    """The pre-rewrite scraper logic: four tree searches plus a full get_text()."""
+    soup = BeautifulSoup(html, 'html.parser')
+    texto_general = soup.get_text()
+    match_id = re.search(r'(?:Sorteo N°|Nro\. Sorteo:)\s*(\d+)', texto_general, re.IGNORECASE)
+    match_date = re.search(r'(\d{2}/\d{2}/\d{4})', texto_general)
+    modes = {json_key: [] for json_key in KEYWORDS.values()}
+    for key_text, json_key in KEYWORDS.items():
+        target_node = soup.find(string=re.compile(re.escape(key_text), re.IGNORECASE))
+        if not target_node:
+            continue
+        found = []
+        for steps, element in enumerate(target_node.next_elements, start=1):
+            if steps > 50:
+                break
+            if isinstance(element, str):
+                txt = element.strip()
+                parts = txt.split('-') if '-' in txt else [txt]
+                for p in parts:
+                    p = p.strip()
+                    if re.match(r'^\d{1,2}$', p) and int(p) <= 45 and int(p) not in found:
+                        found.append(int(p))
+            if len(found) >= 6:
+                break
+        modes[json_key] = sorted(found[:6])
+    return {
+        "id": int(match_id.group(1)) if match_id else 0,
+        "date": match_date.group(1) if match_date else datetime.now().strftime("%d/%m/%Y"),
+        "modes": modes
+    }
+
+def main(fixtures_dir=FIXTURES_DIR, repeat=20):
+    pages = {p.name: p.read_bytes() for p in sorted(Path(fixtures_dir).rglob("*.htm*"))}
+    if not pages:
+        print(f"No .htm/.html fixtures found in {fixtures_dir}")
+        return 1
+
+    mismatches = 0
+    for name, html in pages.items():
+        old, new = legacy_parse(html), parser_sorteo.parsear(html).to_json()
+        if old != new:
+            mismatches += 1
+            print(f"MISMATCH {name}\n  legacy: {old}\n  new:    {new}")
+
+    timings = {}
+    for label, fn in (("legacy", legacy_parse), ("single-pass", parser_sorteo.parsear)):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for html in pages.values():
+                fn(html)
+        timings[label] = (time.perf_counter() - t0) / (repeat * len(pages))
+
+    backend = "lxml" if parser_sorteo.etree is not None else "html.parser"
+    print(f"--- {len(pages)} pages x {repeat}, backend: {backend} ---")
+    for label, t in timings.items():
+        print(f"{label:12s} {t * 1000:8.2f} ms/page")
+    print(f"speedup      x{timings['legacy'] / timings['single-pass']:.1f}")
+    print(f"correctness  {len(pages) - mismatches}/{len(pages)} pages match the legacy parser")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else FIXTURES_DIR,
+                  int(sys.argv[2]) if len(sys.argv) > 2 else 20))
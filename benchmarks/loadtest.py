@@ -0,0 +1,90 @@
+"""
+Load test: p50/p99 latency of light endpoints while other clients keep heavy
+ones busy. Run it against a server started before and after a change.
+
+Usage: python -m benchmarks.loadtest [--url URL] [--clients N] [--heavy-clients M] [--duration S]
+"""
+import argparse
+import threading
+import time
+from collections import defaultdict
+import numpy as np
+import requests
+
+LIGHT = ["/latest", "/history?limit=50"]
+HEAVY = ["/predict/batch?n=20000", "/predict"]
+
+def cliente(base_url, paths, stop, latencias, errores, lock):
+    """Requests `paths` round-robin until `stop` is set, recording latencies per path."""
+    session = requests.Session()
+    i = 0
+    while not stop.is_set():
+        path = paths[i % len(paths)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            ok = session.get(base_url + path, timeout=60).status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - t0
+        with lock:
+            if ok:
+                latencias[path].append(elapsed)
+            else:
+                errores[path] += 1
+
+def loadtest(base_url, clients=4, heavy_clients=48, duration=15.0):
+    """
+    Runs `clients` threads on the light endpoints and `heavy_clients` on the
+    heavy ones for `duration` seconds.
+
+    Returns:
+        dict: path -> {requests, errors, rps, p50_ms, p99_ms}
+    """
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencias = defaultdict(list)
+    errores = defaultdict(int)
+    hilos = [
+        threading.Thread(target=cliente, args=(base_url, paths, stop, latencias, errores, lock), daemon=True)
+        for paths in [LIGHT] * clients + [HEAVY] * heavy_clients
+    ]
+    for h in hilos:
+        h.start()
+    time.sleep(duration)
+    stop.set()
+    for h in hilos:
+        h.join()
+
+    resultados = {}
+    for path in LIGHT + HEAVY:
+        lat = np.array(latencias.get(path, []))
+        resultados[path] = {
+            "requests": len(lat),
+            "errors": errores.get(path, 0),
+            "rps": len(lat) / duration,
+            "p50_ms": float(np.percentile(lat, 50) * 1000) if len(lat) else None,
+            "p99_ms": float(np.percentile(lat, 99) * 1000) if len(lat) else None,
+        }
+    return resultados
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="p50/p99 latency of the API under concurrent clients")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=4, help="Clients on the light endpoints")
+    # More heavy clients than Starlette's 40 default worker threads, or nothing gets starved
+    parser.add_argument("--heavy-clients", type=int, default=48, help="Clients on the heavy endpoints")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds")
+    args = parser.parse_args(argv)
+
+    resultados = loadtest(args.url.rstrip("/"), args.clients, args.heavy_clients, args.duration)
+    print(f"--- {args.clients} light + {args.heavy_clients} heavy clients, {args.duration:.0f}s ---")
+    for path, r in resultados.items():
+        if r["requests"]:
+            print(f"{path:28s} {r['rps']:8.1f} req/s   p50 {r['p50_ms']:8.1f} ms   p99 {r['p99_ms']:8.1f} ms   errors {r['errors']}")
+        else:
+            print(f"{path:28s} no successful requests   errors {r['errors']}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+
+MODALIDADES = ["TRADICIONAL", "LA SEGUNDA", "REVANCHA", "SIEMPRE SALE"]
+
+def generar_sorteos(n_draws, modalidad="TRADICIONAL", seed=0):
+    """
+    Builds a synthetic history shaped like the `sorteos` table.
+    Every draw has 6 unique numbers in 0-45 and two draws happen per week.
+    """
+    rng = np.random.default_rng(seed)
+    numeros = np.sort(rng.random((n_draws, 46)).argpartition(6, axis=1)[:, :6], axis=1)
+
+    inicio = date(1988, 1, 3)
+    fechas = [(inicio + timedelta(days=3.5 * i)).strftime("%d/%m/%Y") for i in range(n_draws)]
+
+    df = pd.DataFrame(numeros, columns=['n1', 'n2', 'n3', 'n4', 'n5', 'n6'])
+    df.insert(0, 'modalidad', modalidad)
+    df.insert(0, 'sorteo_id', np.arange(1, n_draws + 1))
+    df.insert(0, 'fecha', fechas)
+    return df
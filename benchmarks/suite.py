@@ -0,0 +1,188 @@
+"""
+Benchmark suite: synthetic histories of growing size in a temporary SQLite
+DB, timing every analisis function and every API endpoint (in-process
+TestClient). Results go to a JSON file that can be compared against a
+stored baseline to catch regressions.
+
+Usage:
+    python -m benchmarks.suite [--sizes 1000 100000 1000000] [--output results.json]
+    python -m benchmarks.suite --baseline benchmarks/baseline.json [--tolerance 0.25]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from benchmarks.sintetico import MODALIDADES, generar_sorteos
+
+def medir(fn, repeat):
+    """
+    Times `fn` once cold and `repeat` times warm, then once more under
+    tracemalloc for the peak of Python allocations.
+    """
+    t0 = time.perf_counter()
+    fn()
+    cold = time.perf_counter() - t0
+
+    lat = np.empty(repeat)
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        lat[i] = time.perf_counter() - t0
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "cold_ms": cold * 1000,
+        "p50_ms": float(np.percentile(lat, 50) * 1000),
+        "p95_ms": float(np.percentile(lat, 95) * 1000),
+        "p99_ms": float(np.percentile(lat, 99) * 1000),
+        "ops_per_s": float(repeat / lat.sum()) if lat.sum() else None,
+        "peak_kib": peak / 1024,
+    }
+
+def casos_analisis(modalidad, max_id):
+    import analisis
+    return {
+        "get_data": lambda: analisis.get_data(modalidad),
+        "get_stats": lambda: analisis.get_stats(modalidad),
+        "get_hot_numbers": lambda: analisis.get_hot_numbers(modalidad),
+        "get_hot_numbers_n200": lambda: analisis.get_hot_numbers(modalidad, last_n=200),
+        "get_cold_numbers": lambda: analisis.get_cold_numbers(modalidad),
+        "get_heatmap_data": lambda: analisis.get_heatmap_data(modalidad),
+        "get_window_counts": lambda: analisis.get_window_counts(modalidad, max_id // 4, max_id // 2),
+        "get_prediction": lambda: analisis.get_prediction(modalidad),
+        "generar_tickets_1000": lambda: analisis.generar_tickets(modalidad, 1000, seed=0),
+    }
+
+def casos_api(client, max_id):
+    def get(url):
+        def call():
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+        return call
+    return {path: get(path) for path in [
+        "/latest",
+        "/history?limit=50",
+        "/stats/heatmap",
+        "/stats/ticket?numbers=1,2,3,4,5,6",
+        "/stats/together?numbers=7,21",
+        f"/stats/window?from={max_id // 4}&to={max_id // 2}",
+        "/stats/pairs?k=20",
+        "/stats/triples?k=20",
+        "/predict",
+        "/predict/batch?n=1000&seed=0",
+    ]}
+
+def correr(sizes, repeat, seed=0):
+    """
+    Grows one temporary DB through `sizes` (total draws, split over the four
+    modalities) and benchmarks each size.
+    """
+    import database
+    from fastapi.testclient import TestClient
+    import api
+
+    client = TestClient(api.app)
+    resultados = {}
+    cargados = 0
+    for size in sorted(sizes):
+        por_modalidad = max(size // len(MODALIDADES), 1)
+        t0 = time.perf_counter()
+        inserted = 0
+        for i, modalidad in enumerate(MODALIDADES):
+            # Same seed -> the first rows are identical, so only the new tail is inserted
+            df = generar_sorteos(por_modalidad, modalidad, seed=seed + i).iloc[cargados:]
+            inserted += database.guardar_sorteos_bulk(database.filas_dataframe(df), batch_size=5000)["inserted"]
+        ingest = time.perf_counter() - t0
+        cargados = por_modalidad
+
+        print(f"--- {size} draws ({inserted} inserted in {ingest:.1f}s) ---", file=sys.stderr)
+        entry = {"ingest_s": ingest, "ingest_rows_per_s": inserted / ingest if ingest else None,
+                 "analisis": {}, "api": {}}
+        for grupo, casos in (("analisis", casos_analisis("TRADICIONAL", por_modalidad)),
+                             ("api", casos_api(client, por_modalidad))):
+            for nombre, fn in casos.items():
+                entry[grupo][nombre] = r = medir(fn, repeat)
+                print(f"{grupo:9s} {nombre:40s} p50 {r['p50_ms']:9.2f} ms  p99 {r['p99_ms']:9.2f} ms"
+                      f"  cold {r['cold_ms']:9.2f} ms  peak {r['peak_kib']:9.0f} KiB", file=sys.stderr)
+        resultados[str(size)] = entry
+    return resultados
+
+def comparar(actual, baseline, tolerance):
+    """
+    Regressions of `actual` against `baseline`: p50 slower than
+    baseline * (1 + tolerance) for the same size and benchmark.
+    """
+    regresiones = []
+    for size, entry in actual["results"].items():
+        base_entry = baseline["results"].get(size)
+        if not base_entry:
+            continue
+        for grupo in ("analisis", "api"):
+            for nombre, r in entry[grupo].items():
+                base = base_entry.get(grupo, {}).get(nombre)
+                if base and r["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+                    regresiones.append({
+                        "size": size, "group": grupo, "name": nombre,
+                        "baseline_p50_ms": base["p50_ms"], "p50_ms": r["p50_ms"],
+                        "ratio": r["p50_ms"] / base["p50_ms"] if base["p50_ms"] else None,
+                    })
+    return regresiones
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark analisis functions and API endpoints on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="Total draws across the four modalities (up to 1000000)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Compare against this results file; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p50 slowdown (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    tmpdir = tempfile.mkdtemp(prefix="quinimind-bench-")
+    # Must be set before database.py is first imported, it creates the engine at import time
+    os.environ["QUINIMIND_DB_URL"] = "sqlite:///" + os.path.join(tmpdir, "bench.db")
+    try:
+        resultados = correr(args.sizes, args.repeat, args.seed)
+    finally:
+        import database
+        database.cerrar()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    actual = {
+        "meta": {
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": resultados,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(actual, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regresiones = comparar(actual, json.load(f), args.tolerance)
+        for r in regresiones:
+            print(f"REGRESSION {r['size']} {r['group']} {r['name']}: "
+                  f"{r['baseline_p50_ms']:.2f} -> {r['p50_ms']:.2f} ms (x{r['ratio']:.2f})", file=sys.stderr)
+        if regresiones:
+            return 1
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
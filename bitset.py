@@ -0,0 +1,90 @@
+import numpy as np
+from cache_sorteos import derivado
+from database import TOTAL_NUMBERS, mascara_numeros
+
+# popcount of every byte value, for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def mascara(numeros):
+    """Packs a set of numbers 0-45 into one 64-bit mask (bit n = number n)."""
+    return np.uint64(mascara_numeros(numeros))
+
+def mascaras(matriz):
+    """(n_draws x k) numbers -> uint64 mask per row."""
+    matriz = np.asarray(matriz, dtype=np.uint64)
+    if matriz.size == 0:
+        return np.zeros(len(matriz), dtype=np.uint64)
+    return np.bitwise_or.reduce(np.left_shift(np.uint64(1), matriz), axis=1)
+
+def popcount(masks):
+    """Number of set bits of each uint64."""
+    masks = np.ascontiguousarray(masks, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks)
+    return _BYTE_POPCOUNT[masks.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint8)
+
+def validar_numeros(numeros, min_len=1, max_len=6):
+    """Checks a user supplied combination: unique numbers in 0-45."""
+    numeros = [int(n) for n in numeros]
+    if not min_len <= len(numeros) <= max_len:
+        raise ValueError(f"Expected between {min_len} and {max_len} numbers")
+    if len(set(numeros)) != len(numeros):
+        raise ValueError("Numbers must be unique")
+    if any(n < 0 or n >= TOTAL_NUMBERS for n in numeros):
+        raise ValueError(f"Numbers must be between 0 and {TOTAL_NUMBERS - 1}")
+    return numeros
+
+class DrawStore:
+    """
+    Compact bitset view of a modality: one uint64 mask per draw plus the
+    parallel id and date arrays, sorted by sorteo_id ascending.
+    Set questions become AND + popcount over the whole array.
+    """
+
+    __slots__ = ("ids", "fechas", "masks")
+
+    def __init__(self, ids, fechas, masks):
+        self.ids = ids
+        self.fechas = fechas
+        self.masks = masks
+
+    @classmethod
+    def from_draws(cls, draws):
+        # The masks come precomputed from the `mascara` column
+        return cls(draws.ids, draws.fechas, draws.masks)
+
+    def __len__(self):
+        return len(self.masks)
+
+    def overlaps(self, numeros):
+        """How many numbers of `numeros` each historical draw shares."""
+        return popcount(self.masks & mascara(numeros))
+
+    def overlap_histogram(self, numeros):
+        """Count of draws sharing 0..6 numbers with the ticket."""
+        return np.bincount(self.overlaps(numeros), minlength=7)[:7]
+
+    def contienen(self, numeros):
+        """Boolean mask of the draws that include all of `numeros`."""
+        m = mascara(numeros)
+        return (self.masks & m) == m
+
+    def ids_exactos(self, numeros):
+        """Draw ids whose six numbers are exactly `numeros`."""
+        return self.ids[self.masks == mascara(numeros)]
+
+    def ha_salido(self, numeros):
+        """True if this exact combination has ever come out."""
+        return bool((self.masks == mascara(numeros)).any())
+
+    def co_ocurrencias(self, numeros):
+        """
+        Number of draws where all of `numeros` (a pair, triple, ...) came out
+        together, and the ids of those draws.
+        """
+        hits = self.contienen(numeros)
+        return int(hits.sum()), self.ids[hits]
+
+def get_store(modalidad):
+    """DrawStore for a modality, rebuilt only when the draw cache reloads it."""
+    return derivado(modalidad, "store", DrawStore.from_draws)
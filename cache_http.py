@@ -0,0 +1,85 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from fastapi import Response
+from database import data_version
+from historial import to_json_bytes
+
+# Clients may reuse a response for this long, then revalidate with If-None-Match
+CACHE_CONTROL = "public, max-age=300, must-revalidate"
+MAX_ENTRIES = 512
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [t.strip() for t in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+class ResponseCache:
+    """
+    Pre-serialized JSON responses for read endpoints, keyed by path and query
+    params and tagged with database.data_version(). When ingest changes the
+    version every entry is dropped, so nothing stale is ever served.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (etag, body)
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def _check_version(self):
+        version = data_version()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            return self._version
+
+    def respond(self, request, build):
+        """
+        Returns the cached response for `request`, calling `build()` to produce
+        the payload on a miss. Answers 304 when If-None-Match matches.
+        """
+        version = self._check_version()
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is None:
+            body = to_json_bytes(build())
+            etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            entry = (etag, body)
+            with self._lock:
+                self.misses += 1
+                if self._version == version:
+                    self._entries[key] = entry
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+
+        etag, body = entry
+        headers = {
+            "ETag": etag,
+            "Cache-Control": CACHE_CONTROL,
+        }
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "entries": len(self._entries),
+            "data_version": self._version,
+        }
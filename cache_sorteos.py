@@ -0,0 +1,87 @@
+import threading
+from collections import namedtuple
+import numpy as np
+import consultas
+from database import data_version
+
+# Columnar view of one modality, sorted by sorteo_id ascending.
+# masks is the stored `mascara` column as uint64 (bit n = number n)
+Draws = namedtuple("Draws", ["ids", "fechas", "numeros", "masks"])
+# consultas projections loaded for each modality
+COLUMNAS = ("sorteo_id", "fecha", "numeros", "mascara")
+
+class DrawCache:
+    """
+    Process-wide cache of per-modality draw arrays.
+
+    Every lookup compares database.data_version() with the version the
+    arrays were loaded at, so a new draw (stored by the API, the dashboard
+    or the scraper in another process) triggers a single reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # modalidad -> (version, Draws)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, modalidad):
+        version = data_version()
+        entry = self._entries.get(modalidad)
+        if entry and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+
+        with self._lock:
+            # Another thread may have reloaded while we waited
+            entry = self._entries.get(modalidad)
+            if entry and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            draws = self._load(modalidad)
+            self._entries[modalidad] = (version, draws)
+            return draws
+
+    def _load(self, modalidad):
+        cols = consultas.sorteos(modalidad, COLUMNAS)
+        draws = Draws(cols["sorteo_id"], cols["fecha"], cols["numeros"], cols["mascara"].view(np.uint64))
+        # Arrays are shared between threads, make sure nobody mutates them
+        for arr in draws:
+            arr.flags.writeable = False
+        return draws
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "modalidades": sorted(self._entries),
+        }
+
+cache = DrawCache()
+
+def get_draws(modalidad):
+    """Returns the cached Draws arrays for a modality."""
+    return cache.get(modalidad)
+
+_derivados_lock = threading.Lock()
+_derivados = {}  # (nombre, modalidad) -> (Draws it was built from, value)
+
+def derivado(modalidad, nombre, build):
+    """
+    Structure derived from a modality's Draws (prefix sums, bitsets...), built
+    with `build(draws)` and kept until the draw cache reloads the modality
+    (the cache hands out the same Draws object until the data version changes).
+    """
+    draws = get_draws(modalidad)
+    entry = _derivados.get((nombre, modalidad))
+    if entry and entry[0] is draws:
+        return entry[1]
+    value = build(draws)
+    with _derivados_lock:
+        _derivados[(nombre, modalidad)] = (draws, value)
+    return value
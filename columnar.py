@@ -0,0 +1,141 @@
+"""
+Compact columnar copy of the draw history, one directory per modality:
+
+    ids.u32   sorteo_id, uint32
+    dias.i32  draw date as days since 1970-01-01, int32
+    nums.u8   the six numbers of each draw, uint8, row-major (rows x 6)
+    meta.json row count, last sorteo_id and format version
+
+Readers np.memmap the files, so every process (API workers, backtest
+workers) shares one page-cached copy and never parses text or SQL.
+The files only grow: new draws are appended and meta.json, written last,
+says how many rows are valid.
+"""
+import argparse
+import json
+import os
+from collections import namedtuple
+import numpy as np
+import consultas
+from database import cerrar
+from parser_sorteo import KEYWORDS
+
+COLUMNAR_DIR = os.environ.get("QUINIMIND_COLUMNAR_DIR", "columnar")
+FORMAT_VERSION = 1
+SIN_FECHA = np.iinfo(np.int32).min  # Dates that could not be parsed
+
+# file name -> (dtype, values per row)
+COLUMNAS = {
+    "ids.u32": (np.uint32, 1),
+    "dias.i32": (np.int32, 1),
+    "nums.u8": (np.uint8, 6),
+}
+
+Historia = namedtuple("Historia", ["ids", "dias", "numeros"])
+
+def fechas_a_dias(fechas):
+    """fecha_date values (ISO yyyy-mm-dd or None) -> int32 days since the epoch (SIN_FECHA for None)."""
+    dias = np.array(fechas, dtype="datetime64[D]")
+    return np.where(np.isnat(dias), SIN_FECHA, dias.astype(np.int64)).astype(np.int32)
+
+def _directorio(base_dir, modalidad):
+    return os.path.join(base_dir, KEYWORDS.get(modalidad, modalidad.lower().replace(" ", "_")))
+
+def leer_meta(base_dir, modalidad):
+    try:
+        with open(os.path.join(_directorio(base_dir, modalidad), "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == FORMAT_VERSION else None
+
+def _escribir_meta(directorio, meta):
+    tmp = os.path.join(directorio, "meta.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(directorio, "meta.json"))
+
+def actualizar(modalidad, base_dir=COLUMNAR_DIR, completo=False):
+    """
+    Brings the columnar files of a modality up to date with the DB.
+
+    Only draws newer than the last stored sorteo_id are appended. A full
+    rewrite happens when there are no files yet, `completo` is set, or the
+    DB gained draws older than the last stored one (e.g. a backfill).
+
+    Returns:
+        dict: {"modalidad", "rows", "appended", "rebuilt"}
+    """
+    directorio = _directorio(base_dir, modalidad)
+    os.makedirs(directorio, exist_ok=True)
+    meta = None if completo else leer_meta(base_dir, modalidad)
+    if meta is not None and meta["rows"] and consultas.contar(modalidad, meta["max_id"]) != meta["rows"]:
+        meta = None
+
+    rebuilt = meta is None
+    filas = meta["rows"] if meta else 0
+    nuevos = consultas.sorteos(modalidad, ("sorteo_id", "fecha_date", "numeros"),
+                               desde_id=None if rebuilt else meta["max_id"] + 1)
+    nuevas = len(nuevos["sorteo_id"])
+
+    columnas = {
+        "ids.u32": nuevos["sorteo_id"].astype(np.uint32),
+        "dias.i32": fechas_a_dias(nuevos["fecha_date"]),
+        "nums.u8": nuevos["numeros"].astype(np.uint8),
+    }
+    for nombre, (dtype, ancho) in COLUMNAS.items():
+        path = os.path.join(directorio, nombre)
+        with open(path, "wb" if rebuilt else "ab") as f:
+            # Drops a tail left by an append that crashed before meta.json was written
+            f.truncate(filas * ancho * np.dtype(dtype).itemsize)
+            f.write(np.ascontiguousarray(columnas[nombre], dtype=dtype).tobytes())
+
+    max_id = int(columnas["ids.u32"][-1]) if nuevas else (meta["max_id"] if meta else 0)
+    _escribir_meta(directorio, {
+        "format": FORMAT_VERSION,
+        "modalidad": modalidad,
+        "rows": filas + nuevas,
+        "max_id": max_id,
+        "epoch": "1970-01-01",
+        "columns": {nombre: {"dtype": np.dtype(dtype).str, "width": ancho}
+                    for nombre, (dtype, ancho) in COLUMNAS.items()},
+    })
+    return {"modalidad": modalidad, "rows": filas + nuevas, "appended": nuevas, "rebuilt": rebuilt}
+
+def cargar(modalidad, base_dir=COLUMNAR_DIR):
+    """
+    Read-only memory-mapped view of a modality's columns (zero-copy).
+
+    Returns:
+        Historia or None if the files were never written.
+    """
+    meta = leer_meta(base_dir, modalidad)
+    if meta is None:
+        return None
+    directorio = _directorio(base_dir, modalidad)
+    filas = meta["rows"]
+    arrays = []
+    for nombre, (dtype, ancho) in COLUMNAS.items():
+        shape = (filas, ancho) if ancho > 1 else (filas,)
+        if filas == 0:
+            arrays.append(np.zeros(shape, dtype=dtype))
+        else:
+            arrays.append(np.memmap(os.path.join(directorio, nombre), dtype=dtype, mode="r", shape=shape))
+    return Historia(*arrays)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write/refresh the memory-mappable columnar copy of the history")
+    parser.add_argument("--dir", default=COLUMNAR_DIR)
+    parser.add_argument("--modalidad", action="append", help="Repeat for several (default: all)")
+    parser.add_argument("--full", action="store_true", help="Rewrite instead of appending")
+    args = parser.parse_args(argv)
+
+    for modalidad in [m.upper() for m in args.modalidad] if args.modalidad else list(KEYWORDS):
+        r = actualizar(modalidad, args.dir, completo=args.full)
+        accion = "rewritten" if r["rebuilt"] else "appended"
+        print(f"✅ {modalidad}: {r['rows']} rows ({r['appended']} {accion})")
+    cerrar()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,108 @@
+"""
+Read queries behind the analytics, returning NumPy arrays.
+
+Values always travel as bound parameters. Column names only come from the
+COLUMNAS whitelist, and each statement shape is built once and reused, so
+SQLAlchemy's compiled cache and sqlite3's statement cache both hit.
+"""
+from functools import lru_cache
+import numpy as np
+from sqlalchemy import text
+from database import engine
+
+# Projection name -> (SQL columns, dtype)
+COLUMNAS = {
+    "sorteo_id": ("sorteo_id", np.int64),
+    "fecha": ("fecha", object),
+    "fecha_date": ("fecha_date", object),
+    "numeros": ("n1, n2, n3, n4, n5, n6", np.int64),
+    "mascara": ("mascara", np.int64),
+}
+DEFAULT_COLUMNAS = ("sorteo_id", "fecha", "numeros")
+
+@lru_cache(maxsize=64)
+def _sql_sorteos(columnas, con_desde, con_hasta):
+    for c in columnas:
+        if c not in COLUMNAS:
+            raise ValueError(f"Unknown column {c!r}, expected one of {sorted(COLUMNAS)}")
+    query = f"SELECT {', '.join(COLUMNAS[c][0] for c in columnas)} FROM sorteos WHERE modalidad = :modalidad"
+    if con_desde:
+        query += " AND sorteo_id >= :desde"
+    if con_hasta:
+        query += " AND sorteo_id <= :hasta"
+    return text(query + " ORDER BY sorteo_id, id")
+
+def _ejecutar(query, params, conn):
+    if conn is not None:
+        return conn.execute(query, params).all()
+    with engine.connect() as conn:
+        return conn.execute(query, params).all()
+
+def consulta_sorteos(modalidad, columnas=DEFAULT_COLUMNAS, desde_id=None, hasta_id=None):
+    """(statement, params) behind sorteos (also shown by `python database.py explain`)."""
+    query = _sql_sorteos(tuple(columnas), desde_id is not None, hasta_id is not None)
+    params = {"modalidad": modalidad}
+    if desde_id is not None:
+        params["desde"] = int(desde_id)
+    if hasta_id is not None:
+        params["hasta"] = int(hasta_id)
+    return query, params
+
+def sorteos(modalidad, columnas=DEFAULT_COLUMNAS, desde_id=None, hasta_id=None, conn=None):
+    """
+    Draws of one modality ordered by sorteo_id, optionally limited to
+    desde_id <= sorteo_id <= hasta_id (both bounds applied in SQL).
+
+    Args:
+        columnas: names from COLUMNAS; "numeros" is the (n x 6) number matrix.
+        conn: run inside the caller's connection/transaction.
+
+    Returns:
+        dict: column name -> NumPy array.
+    """
+    columnas = tuple(columnas)
+    rows = _ejecutar(*consulta_sorteos(modalidad, columnas, desde_id, hasta_id), conn)
+
+    valores = list(zip(*rows))
+    resultado = {}
+    pos = 0
+    for c in columnas:
+        dtype = COLUMNAS[c][1]
+        if c == "numeros":
+            matriz = np.array(valores[pos:pos + 6], dtype=dtype).reshape(6, -1) if rows else np.zeros((6, 0), dtype)
+            resultado[c] = np.ascontiguousarray(matriz.T)
+            pos += 6
+        else:
+            resultado[c] = np.array(valores[pos] if rows else [], dtype=dtype)
+            pos += 1
+    return resultado
+
+_SQL_CONTAR = text("SELECT COUNT(*) FROM sorteos WHERE modalidad = :modalidad AND sorteo_id <= :hasta")
+
+def contar(modalidad, hasta_id):
+    """Number of draws of a modality with sorteo_id <= hasta_id."""
+    return _ejecutar(_SQL_CONTAR, {"modalidad": modalidad, "hasta": int(hasta_id)}, None)[0][0]
+
+_SQL_ESTADISTICAS = text(
+    "SELECT numero, frecuencia, ultimo_sorteo, ultima_fecha, ventana "
+    "FROM estadisticas WHERE modalidad = :modalidad ORDER BY numero"
+)
+
+def consulta_estadisticas(modalidad):
+    """(statement, params) behind estadisticas (also shown by `python database.py explain`)."""
+    return _SQL_ESTADISTICAS, {"modalidad": modalidad}
+
+def estadisticas(modalidad):
+    """
+    The 46 estadisticas rows of a modality as arrays indexed by number
+    (frecuencia, ultimo, fecha, ventana), or None when it has no draws.
+    """
+    rows = _ejecutar(*consulta_estadisticas(modalidad), None)
+    if not rows or all(r[2] is None for r in rows):
+        return None
+    return {
+        'frecuencia': np.array([r[1] for r in rows], dtype=np.int64),
+        'ultimo': np.array([-1 if r[2] is None else r[2] for r in rows], dtype=np.int64),
+        'fecha': np.array(["Nunca" if r[3] is None else r[3] for r in rows], dtype=object),
+        'ventana': np.array([r[4] for r in rows], dtype=np.int64),
+    }
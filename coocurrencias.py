@@ -0,0 +1,83 @@
+from itertools import combinations
+import numpy as np
+from sqlalchemy import text
+import consultas
+from database import engine, TOTAL_NUMBERS
+
+# Column positions of the C(6,2)=15 pairs and C(6,3)=20 triples inside a sorted draw
+PAIR_COLS = np.array(list(combinations(range(6), 2)))
+TRIPLE_COLS = np.array(list(combinations(range(6), 3)))
+
+def contar(numeros):
+    """
+    Pair and triple co-occurrence counts of a draw matrix.
+
+    Returns:
+        tuple: (46x46 symmetric pair matrix, {(a, b, c): count} for a < b < c)
+    """
+    nums = np.sort(np.asarray(numeros, dtype=np.int64), axis=1)
+    pares = nums[:, PAIR_COLS]
+    pares = pares[pares[..., 0] < pares[..., 1]]  # Drops repeated numbers in bad rows
+    codes = pares[:, 0] * TOTAL_NUMBERS + pares[:, 1]
+    matriz = np.bincount(codes, minlength=TOTAL_NUMBERS ** 2).reshape(TOTAL_NUMBERS, TOTAL_NUMBERS)
+    matriz = matriz + matriz.T
+
+    ternas = nums[:, TRIPLE_COLS]
+    ternas = ternas[(ternas[..., 0] < ternas[..., 1]) & (ternas[..., 1] < ternas[..., 2])]
+    codes = (ternas[:, 0] * TOTAL_NUMBERS + ternas[:, 1]) * TOTAL_NUMBERS + ternas[:, 2]
+    counts = np.bincount(codes, minlength=TOTAL_NUMBERS ** 3)
+    nonzero = np.flatnonzero(counts)
+    a, rest = np.divmod(nonzero, TOTAL_NUMBERS ** 2)
+    b, c = np.divmod(rest, TOTAL_NUMBERS)
+    triples = dict(zip(zip(a.tolist(), b.tolist(), c.tolist()), counts[nonzero].tolist()))
+    return matriz, triples
+
+def rebuild(modalidades):
+    """Recomputes the pares/ternas tables of the given modalities from `sorteos`."""
+    with engine.begin() as conn:
+        for mod in modalidades:
+            matriz, triples = contar(consultas.sorteos(mod, ("numeros",), conn=conn)["numeros"])
+
+            conn.execute(text("DELETE FROM pares WHERE modalidad = :m"), {"m": mod})
+            conn.execute(text("DELETE FROM ternas WHERE modalidad = :m"), {"m": mod})
+            a, b = np.nonzero(np.triu(matriz, k=1))
+            if len(a):
+                conn.execute(
+                    text("INSERT INTO pares (modalidad, a, b, cuenta) VALUES (:m, :a, :b, :c)"),
+                    [{"m": mod, "a": int(x), "b": int(y), "c": int(matriz[x, y])} for x, y in zip(a, b)]
+                )
+            if triples:
+                conn.execute(
+                    text("INSERT INTO ternas (modalidad, a, b, c, cuenta) VALUES (:m, :a, :b, :c, :n)"),
+                    [{"m": mod, "a": x, "b": y, "c": z, "n": n} for (x, y, z), n in triples.items()]
+                )
+
+def consulta_top_pares(modalidad, k=20, numero=None):
+    """(statement, params) behind top_pares (also shown by `python database.py explain`)."""
+    query = "SELECT a, b, cuenta FROM pares WHERE modalidad = :m"
+    params = {"m": modalidad, "k": k}
+    if numero is not None:
+        query += " AND (a = :n OR b = :n)"
+        params["n"] = numero
+    return text(query + " ORDER BY cuenta DESC, a, b LIMIT :k"), params
+
+def consulta_top_ternas(modalidad, k=20, numero=None):
+    """(statement, params) behind top_ternas (also shown by `python database.py explain`)."""
+    query = "SELECT a, b, c, cuenta FROM ternas WHERE modalidad = :m"
+    params = {"m": modalidad, "k": k}
+    if numero is not None:
+        query += " AND (a = :n OR b = :n OR c = :n)"
+        params["n"] = numero
+    return text(query + " ORDER BY cuenta DESC, a, b, c LIMIT :k"), params
+
+def top_pares(modalidad, k=20, numero=None):
+    """The k most frequent pairs, optionally only those containing `numero`."""
+    with engine.connect() as conn:
+        rows = conn.execute(*consulta_top_pares(modalidad, k, numero)).all()
+    return [{"numbers": [a, b], "count": cuenta} for a, b, cuenta in rows]
+
+def top_ternas(modalidad, k=20, numero=None):
+    """The k most frequent triples, optionally only those containing `numero`."""
+    with engine.connect() as conn:
+        rows = conn.execute(*consulta_top_ternas(modalidad, k, numero)).all()
+    return [{"numbers": [a, b, c], "count": cuenta} for a, b, c, cuenta in rows]
@@ -1,10 +1,27 @@
-
-from sqlalchemy import create_engine, Column, Integer, String, UniqueConstraint
+import os
+from datetime import datetime
+from itertools import combinations, islice
+from sqlalchemy import create_engine, event, inspect, select, text, Column, Date, Index, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Database configuration (override with QUINIMIND_DB_URL, e.g. "sqlite://" for an in-memory DB)
+DATABASE_URL = os.environ.get("QUINIMIND_DB_URL", "sqlite:///quini6.db")
 
-# Database configuration
-DATABASE_URL = "sqlite:///quini6.db"
+# Applied to every new SQLite connection. WAL lets the API/dashboard readers
+# and the scraper writer work at the same time without blocking each other.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("QUINIMIND_DB_JOURNAL", "WAL"),
+    "synchronous": os.environ.get("QUINIMIND_DB_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.environ.get("QUINIMIND_DB_MMAP_BYTES", 256 * 1024 * 1024)),
+    "cache_size": -int(os.environ.get("QUINIMIND_DB_CACHE_KB", 64 * 1024)),  # Negative = KiB
+    "busy_timeout": int(os.environ.get("QUINIMIND_DB_BUSY_MS", 5000)),
+    "temp_store": "MEMORY",
+}
+POOL_SIZE = int(os.environ.get("QUINIMIND_DB_POOL_SIZE", 10))
+POOL_OVERFLOW = int(os.environ.get("QUINIMIND_DB_POOL_OVERFLOW", 30))
 
 Base = declarative_base()
 
@@ -12,7 +29,8 @@ class Sorteo(Base):
     __tablename__ = 'sorteos'
 
     id = Column(Integer, primary_key=True)
-    fecha = Column(String)
+    fecha = Column(String)  # dd/mm/yyyy as published
+    fecha_date = Column(Date)  # Same date, typed (added by migrar() on older DBs)
     sorteo_id = Column(Integer, index=True)
     modalidad = Column(String)
     n1 = Column(Integer)
@@ -21,22 +39,247 @@ class Sorteo(Base):
     n4 = Column(Integer)
     n5 = Column(Integer)
     n6 = Column(Integer)
+    mascara = Column(Integer)  # Bit n set for each number n, see mascara_numeros
 
-    # Constraint to prevent duplicates for the same modality in the same draw
     __table_args__ = (
+        # Constraint to prevent duplicates for the same modality in the same draw
         UniqueConstraint('sorteo_id', 'modalidad', name='uix_sorteo_modalidad'),
+        # Every per-modality read filters on modalidad and walks sorteo_id in order
+        Index('ix_sorteos_modalidad_sorteo', 'modalidad', 'sorteo_id'),
     )
 
     def __repr__(self):
         return f"<Sorteo(id={self.sorteo_id}, mod={self.modalidad})>"
 
+# Number of recent draws covered by EstadisticaNumero.ventana (hot numbers window)
+HOT_WINDOW = 50
+TOTAL_NUMBERS = 46 # Balls go from 00 to 45
+
+class EstadisticaNumero(Base):
+    """
+    Per-modality running statistics for one number, kept up to date on ingest.
+    """
+    __tablename__ = 'estadisticas'
+
+    id = Column(Integer, primary_key=True)
+    modalidad = Column(String, nullable=False)
+    numero = Column(Integer, nullable=False)
+    frecuencia = Column(Integer, nullable=False, default=0)
+    ultimo_sorteo = Column(Integer)  # NULL = never came out
+    ultima_fecha = Column(String)
+    ventana = Column(Integer, nullable=False, default=0)  # Appearances in the last HOT_WINDOW draws
+
+    __table_args__ = (
+        UniqueConstraint('modalidad', 'numero', name='uix_estadistica_numero'),
+    )
+
+    def __repr__(self):
+        return f"<EstadisticaNumero(mod={self.modalidad}, n={self.numero}, f={self.frecuencia})>"
+
+def is_memory_url(url):
+    """True for SQLite URLs that point at a private in-memory database."""
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+def create_db_engine(url=DATABASE_URL, pragmas=None):
+    """
+    Builds an engine tuned for multi-threaded access.
+
+    File databases get a connection pool sized for uvicorn's threadpool and the
+    SQLITE_PRAGMAS on every connection. In-memory databases share a single
+    connection (StaticPool), otherwise each connection would see an empty DB.
+    """
+    if not url.startswith("sqlite"):
+        return create_engine(url, pool_size=POOL_SIZE, max_overflow=POOL_OVERFLOW)
+
+    memory = is_memory_url(url)
+    pragmas = dict(SQLITE_PRAGMAS if pragmas is None else pragmas)
+    if memory:
+        # WAL and mmap don't apply to in-memory databases
+        pragmas.pop("journal_mode", None)
+        pragmas.pop("mmap_size", None)
+        new_engine = create_engine(
+            url, connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+    else:
+        new_engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            pool_size=POOL_SIZE,
+            max_overflow=POOL_OVERFLOW,
+        )
+
+    @event.listens_for(new_engine, "connect")
+    def _apply_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return new_engine
+
+class ParCoocurrencia(Base):
+    """How many draws of a modality contained both numbers a < b."""
+    __tablename__ = 'pares'
+
+    id = Column(Integer, primary_key=True)
+    modalidad = Column(String, nullable=False)
+    a = Column(Integer, nullable=False)
+    b = Column(Integer, nullable=False)
+    cuenta = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint('modalidad', 'a', 'b', name='uix_par'),
+        Index('ix_pares_top', 'modalidad', 'cuenta'),
+    )
+
+class TernaCoocurrencia(Base):
+    """How many draws of a modality contained the three numbers a < b < c (sparse)."""
+    __tablename__ = 'ternas'
+
+    id = Column(Integer, primary_key=True)
+    modalidad = Column(String, nullable=False)
+    a = Column(Integer, nullable=False)
+    b = Column(Integer, nullable=False)
+    c = Column(Integer, nullable=False)
+    cuenta = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint('modalidad', 'a', 'b', 'c', name='uix_terna'),
+        Index('ix_ternas_top', 'modalidad', 'cuenta'),
+    )
+
+class GeneracionEstadisticas(Base):
+    """
+    Single row (id 1) counting full stats rebuilds. Part of data_version():
+    a bulk load commits its draws before the rebuild, so caches filled in
+    between must be dropped again when the rebuilt stats commit.
+    """
+    __tablename__ = 'generacion_estadisticas'
+
+    id = Column(Integer, primary_key=True)
+    generacion = Column(Integer, nullable=False, default=0)
+
 # Setup DB connection
-engine = create_engine(DATABASE_URL)
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def parse_fecha(fecha):
+    """dd/mm/yyyy or dd-mm-yyyy -> date, None if it doesn't parse."""
+    try:
+        return datetime.strptime(fecha.strip().replace('-', '/'), "%d/%m/%Y").date()
+    except (AttributeError, ValueError):
+        return None
+
+def mascara_numeros(numeros):
+    """Numbers 0-45 -> integer with bit n set for each number n."""
+    mask = 0
+    for n in numeros:
+        mask |= 1 << int(n)
+    return mask
+
+# Columns added to `sorteos` after the first release: name -> SQL type
+COLUMNAS_MIGRADAS = {"fecha_date": "DATE", "mascara": "INTEGER"}
+# Stored in PRAGMA user_version once migrar() brought the file up to date.
+# Bump it when migrar() learns a new step.
+SCHEMA_VERSION = 1
+
+def migrar():
+    """
+    Brings a `sorteos` table created by an older version up to the current
+    schema: adds the missing columns, backfills them and creates missing
+    indexes. Runs once per database file: the backfills scan the whole
+    table, so afterwards PRAGMA user_version makes it a single read.
+    """
+    with engine.connect() as conn:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() >= SCHEMA_VERSION:
+            return
+
+    existentes = {c["name"] for c in inspect(engine).get_columns("sorteos")}
+    with engine.begin() as conn:
+        for nombre, tipo in COLUMNAS_MIGRADAS.items():
+            if nombre not in existentes:
+                conn.execute(text(f"ALTER TABLE sorteos ADD COLUMN {nombre} {tipo}"))
+
+        # Both date formats that were ever stored (dd/mm/yyyy and dd-mm-yyyy) to ISO, as Date stores it
+        conn.execute(text(
+            "UPDATE sorteos SET fecha_date = "
+            "substr(fecha, 7, 4) || '-' || substr(fecha, 4, 2) || '-' || substr(fecha, 1, 2) "
+            "WHERE fecha_date IS NULL "
+            "AND fecha GLOB '[0-9][0-9][/-][0-9][0-9][/-][0-9][0-9][0-9][0-9]'"
+        ))
+        conn.execute(text(
+            "UPDATE sorteos SET mascara = "
+            "(1 << n1) | (1 << n2) | (1 << n3) | (1 << n4) | (1 << n5) | (1 << n6) "
+            "WHERE mascara IS NULL"
+        ))
+        for index in Sorteo.__table__.indexes:
+            index.create(bind=conn, checkfirst=True)
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
 def init_db():
-    """Initializes the database tables."""
+    """Initializes the database tables (schema only, run on import)."""
     Base.metadata.create_all(bind=engine)
+    migrar()
+
+def asegurar_estadisticas():
+    """
+    Fills estadisticas, pares and ternas once for databases created before
+    those tables existed. A no-op afterwards.
+
+    Not run on import: the rebuild goes through coocurrencias and consultas,
+    which import this module. Entry points call it once everything is loaded.
+    """
+    with engine.connect() as conn:
+        has_draws = conn.execute(text("SELECT 1 FROM sorteos LIMIT 1")).first()
+        has_stats = conn.execute(text("SELECT 1 FROM estadisticas LIMIT 1")).first()
+        has_pairs = conn.execute(text("SELECT 1 FROM pares LIMIT 1")).first()
+    if has_draws and not (has_stats and has_pairs):
+        rebuild_estadisticas()
+
+_SQL_DATA_VERSION = text(
+    "SELECT (SELECT COALESCE(MAX(sorteo_id), 0) FROM sorteos), (SELECT COALESCE(MAX(id), 0) FROM sorteos), "
+    "COALESCE((SELECT generacion FROM generacion_estadisticas WHERE id = 1), 0)"
+)
+
+def data_version():
+    """
+    Cheap fingerprint of the data: (max sorteo_id, max row id, stats rebuild
+    generation). It changes whenever a draw is stored or the stats are
+    rebuilt, by this process or any other, so in-memory caches compare it to
+    know when to reload.
+
+    All three are single b-tree seeks (each MAX in its own subquery so
+    SQLite's min/max optimization applies); COUNT(*) would scan the whole table.
+    """
+    with engine.connect() as conn:
+        max_id, ultima_fila, generacion = conn.execute(_SQL_DATA_VERSION).one()
+    return (max_id, ultima_fila, generacion)
+
+def _consulta_existe(sorteo_id, modalidad):
+    return select(Sorteo.id).where(Sorteo.sorteo_id == sorteo_id, Sorteo.modalidad == modalidad).limit(1)
+
+def _insertar_sorteo(session, datos):
+    """
+    Inserts one draw and folds it into the stats, inside the caller's transaction.
+
+    Returns:
+        bool: False if (sorteo_id, modalidad) was already stored.
+    """
+    if session.execute(_consulta_existe(datos['sorteo_id'], datos['modalidad'])).first():
+        return False
+
+    session.add(Sorteo(
+        fecha=datos['fecha'],
+        fecha_date=parse_fecha(datos['fecha']),
+        sorteo_id=datos['sorteo_id'],
+        modalidad=datos['modalidad'],
+        n1=datos['n1'], n2=datos['n2'], n3=datos['n3'],
+        n4=datos['n4'], n5=datos['n5'], n6=datos['n6'],
+        mascara=mascara_numeros(_numeros(datos))
+    ))
+    session.flush()
+    _aplicar_estadisticas(session, datos)
+    return True
 
 def guardar_sorteo(datos):
     """
@@ -48,25 +291,10 @@ def guardar_sorteo(datos):
     """
     session = SessionLocal()
     try:
-        # Check if already exists
-        exists = session.query(Sorteo).filter_by(
-            sorteo_id=datos['sorteo_id'],
-            modalidad=datos['modalidad']
-        ).first()
-
-        if exists:
+        if not _insertar_sorteo(session, datos):
             print(f"  [DB] Skipped duplicate: Draw {datos['sorteo_id']} - {datos['modalidad']}")
             return
 
-        # Create new record
-        nuevo_sorteo = Sorteo(
-            fecha=datos['fecha'],
-            sorteo_id=datos['sorteo_id'],
-            modalidad=datos['modalidad'],
-            n1=datos['n1'], n2=datos['n2'], n3=datos['n3'],
-            n4=datos['n4'], n5=datos['n5'], n6=datos['n6']
-        )
-        session.add(nuevo_sorteo)
         session.commit()
         print(f"  [DB] Saved: Draw {datos['sorteo_id']} - {datos['modalidad']}")
 
@@ -76,5 +304,285 @@ def guardar_sorteo(datos):
     finally:
         session.close()
 
-# Initialize tables on import
+def guardar_sorteos(filas):
+    """
+    Saves the modalities of a new draw in one transaction, keeping the stats
+    incremental. Unlike guardar_sorteo, errors are raised to the caller.
+
+    Returns:
+        dict: {"inserted": int, "skipped": int}
+    """
+    inserted = skipped = 0
+    session = SessionLocal()
+    try:
+        for datos in filas:
+            if _insertar_sorteo(session, datos):
+                inserted += 1
+            else:
+                skipped += 1
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    return {"inserted": inserted, "skipped": skipped}
+
+# Keys of a draw row as guardar_sorteo(s) and guardar_sorteos_bulk take it
+COLUMNAS_SORTEO = ['fecha', 'sorteo_id', 'modalidad', 'n1', 'n2', 'n3', 'n4', 'n5', 'n6']
+
+def filas_dataframe(df):
+    """DataFrame rows (COLUMNAS_SORTEO) as dicts of plain Python values, for guardar_sorteos_bulk."""
+    cols = [df[c].tolist() for c in COLUMNAS_SORTEO]
+    return (dict(zip(COLUMNAS_SORTEO, valores)) for valores in zip(*cols))
+
+def guardar_sorteos_bulk(filas, batch_size=500):
+    """
+    Saves many draws at once, for historical backfills.
+
+    Rows are streamed from `filas` in batches; each batch is a single
+    `INSERT ... ON CONFLICT(sorteo_id, modalidad) DO NOTHING` in its own
+    transaction. The estadisticas of every modality that received rows are
+    rebuilt once at the end instead of per row.
+
+    Args:
+        filas (iterable): Dicts with the same keys guardar_sorteo expects.
+        batch_size (int): Rows per transaction.
+
+    Returns:
+        dict: {"inserted": int, "skipped": int}
+    """
+    stmt = sqlite_insert(Sorteo.__table__).on_conflict_do_nothing(
+        index_elements=['sorteo_id', 'modalidad']
+    )
+
+    inserted = skipped = 0
+    touched = set()
+    filas = iter(filas)
+    try:
+        while True:
+            batch = [
+                {**{c: fila[c] for c in COLUMNAS_SORTEO},
+                 'fecha_date': parse_fecha(fila['fecha']), 'mascara': mascara_numeros(_numeros(fila))}
+                for fila in islice(filas, batch_size)
+            ]
+            if not batch:
+                break
+            with engine.begin() as conn:
+                before = conn.execute(text("SELECT total_changes()")).scalar()
+                conn.execute(stmt, batch)
+                added = conn.execute(text("SELECT total_changes()")).scalar() - before
+            inserted += added
+            skipped += len(batch) - added
+            if added:
+                touched.update(fila['modalidad'] for fila in batch)
+    finally:
+        # Committed batches stay even if `filas` fails later, so their stats are rebuilt too
+        for modalidad in sorted(touched):
+            rebuild_estadisticas(modalidad)
+    return {"inserted": inserted, "skipped": skipped}
+
+def _numeros(datos):
+    return [datos['n1'], datos['n2'], datos['n3'], datos['n4'], datos['n5'], datos['n6']]
+
+def _aplicar_estadisticas(session, datos):
+    """
+    Folds one newly inserted draw into the estadisticas table, inside the
+    caller's transaction. Touches the 6 drawn numbers plus, when the hot
+    window shifts, the 6 numbers of the draw that just left it.
+    """
+    modalidad = datos['modalidad']
+    sorteo_id = datos['sorteo_id']
+
+    exists = session.execute(
+        text("SELECT 1 FROM estadisticas WHERE modalidad = :m LIMIT 1"), {"m": modalidad}
+    ).first()
+    if not exists:
+        session.execute(
+            text("INSERT INTO estadisticas (modalidad, numero, frecuencia, ventana) VALUES (:m, :n, 0, 0)"),
+            [{"m": modalidad, "n": n} for n in range(TOTAL_NUMBERS)]
+        )
+
+    session.execute(
+        text(
+            "UPDATE estadisticas SET frecuencia = frecuencia + 1, "
+            "ultima_fecha = CASE WHEN ultimo_sorteo IS NULL OR ultimo_sorteo < :sid THEN :fecha ELSE ultima_fecha END, "
+            "ultimo_sorteo = CASE WHEN ultimo_sorteo IS NULL OR ultimo_sorteo < :sid THEN :sid ELSE ultimo_sorteo END "
+            "WHERE modalidad = :m AND numero = :n"
+        ),
+        [{"m": modalidad, "n": n, "sid": sorteo_id, "fecha": datos['fecha']} for n in _numeros(datos)]
+    )
+
+    _aplicar_coocurrencias(session, modalidad, _numeros(datos))
+
+    # The window holds the HOT_WINDOW newest draws. Backfilled (older) draws don't enter it.
+    newer = session.execute(
+        text("SELECT COUNT(*) FROM sorteos WHERE modalidad = :m AND sorteo_id > :sid"),
+        {"m": modalidad, "sid": sorteo_id}
+    ).scalar()
+    if newer >= HOT_WINDOW:
+        return
+
+    ventana = text("UPDATE estadisticas SET ventana = ventana + :d WHERE modalidad = :m AND numero = :n")
+    session.execute(ventana, [{"m": modalidad, "n": n, "d": 1} for n in _numeros(datos)])
+
+    dropped = session.execute(
+        text(
+            "SELECT n1, n2, n3, n4, n5, n6 FROM sorteos WHERE modalidad = :m "
+            "ORDER BY sorteo_id DESC LIMIT 1 OFFSET :w"
+        ),
+        {"m": modalidad, "w": HOT_WINDOW}
+    ).first()
+    if dropped:
+        session.execute(ventana, [{"m": modalidad, "n": n, "d": -1} for n in dropped])
+
+def _aplicar_coocurrencias(session, modalidad, numeros):
+    """Adds one draw to the pair (15) and triple (20) counters."""
+    nums = sorted(set(numeros))
+    session.execute(
+        text(
+            "INSERT INTO pares (modalidad, a, b, cuenta) VALUES (:m, :a, :b, 1) "
+            "ON CONFLICT(modalidad, a, b) DO UPDATE SET cuenta = cuenta + 1"
+        ),
+        [{"m": modalidad, "a": a, "b": b} for a, b in combinations(nums, 2)]
+    )
+    session.execute(
+        text(
+            "INSERT INTO ternas (modalidad, a, b, c, cuenta) VALUES (:m, :a, :b, :c, 1) "
+            "ON CONFLICT(modalidad, a, b, c) DO UPDATE SET cuenta = cuenta + 1"
+        ),
+        [{"m": modalidad, "a": a, "b": b, "c": c} for a, b, c in combinations(nums, 3)]
+    )
+
+_SQL_NUEVA_GENERACION = text(
+    "INSERT INTO generacion_estadisticas (id, generacion) VALUES (1, 1) "
+    "ON CONFLICT(id) DO UPDATE SET generacion = generacion + 1"
+)
+
+def rebuild_estadisticas(modalidad=None):
+    """
+    Recomputes the estadisticas table from scratch out of `sorteos`.
+    Used for recovery and after bulk loads.
+
+    Args:
+        modalidad (str): Only rebuild this modality. None rebuilds all of them.
+    """
+    union = " UNION ALL ".join(
+        f"SELECT sorteo_id, fecha, {col} AS numero FROM {{src}}"
+        for col in ('n1', 'n2', 'n3', 'n4', 'n5', 'n6')
+    )
+    totales_sql = text(
+        # SQLite returns `fecha` from the row holding MAX(sorteo_id)
+        "SELECT numero, COUNT(*), MAX(sorteo_id), fecha FROM ("
+        + union.format(src="(SELECT * FROM sorteos WHERE modalidad = :m)")
+        + ") GROUP BY numero"
+    )
+    ventana_sql = text(
+        "SELECT numero, COUNT(*) FROM ("
+        + union.format(src="(SELECT * FROM sorteos WHERE modalidad = :m ORDER BY sorteo_id DESC LIMIT :w)")
+        + ") GROUP BY numero"
+    )
+
+    with engine.begin() as conn:
+        if modalidad is None:
+            modalidades = [r[0] for r in conn.execute(text("SELECT DISTINCT modalidad FROM sorteos"))]
+            conn.execute(text("DELETE FROM estadisticas"))
+        else:
+            modalidades = [modalidad]
+            conn.execute(text("DELETE FROM estadisticas WHERE modalidad = :m"), {"m": modalidad})
+
+        for mod in modalidades:
+            totales = {r[0]: r[1:] for r in conn.execute(totales_sql, {"m": mod})}
+            ventana = dict(conn.execute(ventana_sql, {"m": mod, "w": HOT_WINDOW}).all())
+            filas = []
+            for n in range(TOTAL_NUMBERS):
+                frecuencia, ultimo, fecha = totales.get(n, (0, None, None))
+                filas.append({
+                    "m": mod, "n": n, "f": frecuencia, "u": ultimo,
+                    "fecha": fecha, "v": ventana.get(n, 0)
+                })
+            conn.execute(
+                text(
+                    "INSERT INTO estadisticas (modalidad, numero, frecuencia, ultimo_sorteo, ultima_fecha, ventana) "
+                    "VALUES (:m, :n, :f, :u, :fecha, :v)"
+                ),
+                filas
+            )
+
+    # Pair/triple counters are rebuilt vectorized from the draw matrix
+    import coocurrencias
+    coocurrencias.rebuild(modalidades)
+
+    # Only now are the stats consistent with the draws: caches filled since
+    # the draws committed must reload
+    with engine.begin() as conn:
+        conn.execute(_SQL_NUEVA_GENERACION)
+    return modalidades
+
+# Initialize tables on import (stats are filled by asegurar_estadisticas)
 init_db()
+
+def cerrar():
+    """
+    Closes every pooled connection; called at the end of command-line entry points.
+    Closing the last connection checkpoints the WAL back into quini6.db.
+    """
+    engine.dispose()
+
+def consultas_endpoints():
+    """
+    (name, statement, params) of the SQL each endpoint runs, with sample
+    parameters. Taken from the modules that run them, so explain can't drift.
+    """
+    # Imported here: those modules import this one
+    import cache_sorteos
+    import consultas
+    import coocurrencias
+    import historial
+
+    return [
+        ("data_version (every cached endpoint)", _SQL_DATA_VERSION, {}),
+        ("/latest", historial.consulta_latest(), {}),
+        ("/history", historial.consulta_history(50, 10**9), {}),
+        ("draw cache (/stats/ticket, /stats/together, /stats/window, /predict)",
+         *consultas.consulta_sorteos("TRADICIONAL", cache_sorteos.COLUMNAS)),
+        ("/stats/heatmap, hot/cold", *consultas.consulta_estadisticas("TRADICIONAL")),
+        ("/stats/pairs", *coocurrencias.consulta_top_pares("TRADICIONAL", 20)),
+        ("/stats/triples", *coocurrencias.consulta_top_ternas("TRADICIONAL", 20)),
+        ("ingest duplicate check", _consulta_existe(1, "TRADICIONAL"), {}),
+    ]
+
+def explain():
+    """Prints SQLite's EXPLAIN QUERY PLAN of every endpoint query."""
+    with engine.connect() as conn:
+        for nombre, stmt, params in consultas_endpoints():
+            compiled = stmt.compile(dialect=engine.dialect)
+            valores = {**compiled.params, **params}
+            args = tuple(valores[k] for k in compiled.positiontup)
+            print(f"--- {nombre}")
+            for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + compiled.string, args):
+                print(f"    {row[-1]}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="QuiniMind database maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rebuild = sub.add_parser("rebuild", help="Recompute estadisticas, pares and ternas from sorteos")
+    rebuild.add_argument("--modalidad", help="Only rebuild this modality")
+    importar = sub.add_parser("import-csv", help="Bulk load a quini6_historico.csv style file (see importar_csv.py)")
+    importar.add_argument("path", nargs="?", default="quini6_historico.csv")
+    importar.add_argument("--batch-size", type=int, default=5000)
+    sub.add_parser("explain", help="Show the query plan of every endpoint query")
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        done = rebuild_estadisticas(args.modalidad.upper() if args.modalidad else None)
+        print(f"  [DB] Rebuilt stats for: {', '.join(done) or 'nothing'}")
+    elif args.command == "import-csv":
+        import importar_csv
+        importar_csv.main([args.path, "--batch-size", str(args.batch_size)])
+    elif args.command == "explain":
+        explain()
+
+    cerrar()
@@ -0,0 +1,107 @@
+import argparse
+import gzip
+import hashlib
+import os
+import shutil
+import time
+import analisis
+import historial
+from database import cerrar, data_version
+from parser_sorteo import KEYWORDS
+
+# Static snapshot served by GitHub Pages next to data.json
+OUTPUT_DIR = os.path.join("quinimind-frontend", "public", "api")
+HISTORY_PAGE_SIZE = 100
+
+def payloads(max_history_pages=None):
+    """
+    Yields (relative path, payload) for every read endpoint, the same data the
+    API returns: latest draw, keyset-paged history, and heatmap/hot/cold per modality.
+    """
+    yield "latest.json", historial.get_latest()
+
+    before_id = None
+    page = 1
+    while max_history_pages is None or page <= max_history_pages:
+        rows = historial.get_history(limit=HISTORY_PAGE_SIZE, before_id=before_id)
+        if not rows:
+            break
+        yield f"history/{page}.json", rows
+        before_id = rows[-1]["id"]
+        page += 1
+
+    for modalidad, slug in KEYWORDS.items():
+        df = analisis.get_heatmap_data(modalidad)
+        yield f"heatmap/{slug}.json", [] if df.empty else df.to_dict(orient="records")
+        yield f"hot/{slug}.json", analisis.get_hot_numbers(modalidad)
+        yield f"cold/{slug}.json", analisis.get_cold_numbers(modalidad)
+
+def _write(path, body, gzip_files):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(body)
+    if gzip_files:
+        # mtime=0 keeps the .gz byte-identical between runs with the same data
+        with gzip.GzipFile(path + ".gz", "wb", compresslevel=9, mtime=0) as f:
+            f.write(body)
+
+def exportar(output_dir=OUTPUT_DIR, gzip_files=False, max_history_pages=None, prune=True):
+    """
+    Renders the snapshot under <output_dir>/v<max_id>-<last row id>-<stats
+    generation>/ and writes <output_dir>/manifest.json with the content hash
+    of every file.
+
+    Versioned files never change once written, so they can be cached forever;
+    only manifest.json has to be revalidated.
+
+    Returns:
+        dict: the manifest.
+    """
+    max_id, ultima_fila, generacion = data_version()
+    version = f"v{max_id}-{ultima_fila}-{generacion}"
+    base_dir = os.path.join(output_dir, version)
+
+    files = {}
+    history_pages = 0
+    for name, payload in payloads(max_history_pages):
+        body = historial.to_json_bytes(payload)
+        _write(os.path.join(base_dir, name), body, gzip_files)
+        files[name] = {"sha256": hashlib.sha256(body).hexdigest(), "bytes": len(body)}
+        if name.startswith("history/"):
+            history_pages += 1
+
+    manifest = {
+        "version": version,
+        "base": f"{version}/",
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "gzip": gzip_files,
+        "history_page_size": HISTORY_PAGE_SIZE,
+        "history_pages": history_pages,
+        "modalidades": {slug: modalidad for modalidad, slug in KEYWORDS.items()},
+        "files": files,
+    }
+    _write(os.path.join(output_dir, "manifest.json"), historial.to_json_bytes(manifest), gzip_files)
+
+    if prune:
+        for entry in os.listdir(output_dir):
+            if entry.startswith("v") and entry != version and os.path.isdir(os.path.join(output_dir, entry)):
+                shutil.rmtree(os.path.join(output_dir, entry))
+    return manifest
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a static JSON snapshot of the API for the frontends")
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--gzip", action="store_true", help="Also write pre-compressed .gz files")
+    parser.add_argument("--history-pages", type=int, help="Limit history to N pages")
+    parser.add_argument("--keep-old", action="store_true", help="Don't delete previous versions")
+    args = parser.parse_args(argv)
+
+    manifest = exportar(args.output, gzip_files=args.gzip,
+                        max_history_pages=args.history_pages, prune=not args.keep_old)
+    size = sum(f["bytes"] for f in manifest["files"].values())
+    print(f"✅ Snapshot {manifest['version']}: {len(manifest['files'])} files, {size / 1024:.1f} KiB in {args.output}")
+    cerrar()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
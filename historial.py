@@ -0,0 +1,91 @@
+import json
+from itertools import groupby
+from sqlalchemy import func, select
+from database import engine, Sorteo
+from metricas import cronometrado
+
+NUM_COLS = [Sorteo.n1, Sorteo.n2, Sorteo.n3, Sorteo.n4, Sorteo.n5, Sorteo.n6]
+
+def _json_default(obj):
+    # NumPy scalars coming out of pandas/analisis
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def to_json_bytes(payload):
+    """Minified UTF-8 JSON, shared by the API response cache and the static export."""
+    return json.dumps(payload, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+def clave_modalidad(modalidad):
+    """Normalizes a modality name to the camelCase key used by the frontends."""
+    nombre = modalidad.upper()
+    if "SEGUNDA" in nombre:
+        return "laSegunda"
+    if "REVANCHA" in nombre:
+        return "revancha"
+    if "SIEMPRE" in nombre:
+        return "siempreSale"
+    return "tradicional"
+
+def consulta_latest():
+    """The statement behind get_latest (also shown by `python database.py explain`)."""
+    latest = select(func.max(Sorteo.sorteo_id)).scalar_subquery()
+    return (
+        select(Sorteo.sorteo_id, Sorteo.fecha, Sorteo.modalidad, *NUM_COLS)
+        .where(Sorteo.sorteo_id == latest)
+        .order_by(Sorteo.id)
+    )
+
+def consulta_history(limit=50, before_id=None):
+    """The statement behind get_history (also shown by `python database.py explain`)."""
+    page_ids = select(Sorteo.sorteo_id).distinct()
+    if before_id is not None:
+        page_ids = page_ids.where(Sorteo.sorteo_id < before_id)
+    page_ids = page_ids.order_by(Sorteo.sorteo_id.desc()).limit(limit).subquery()
+
+    return (
+        select(Sorteo.sorteo_id, Sorteo.fecha, Sorteo.modalidad, *NUM_COLS)
+        .where(Sorteo.sorteo_id.in_(select(page_ids.c.sorteo_id)))
+        .order_by(Sorteo.sorteo_id.desc(), Sorteo.id)
+    )
+
+@cronometrado
+def get_latest():
+    """Returns the most recent draw (sorteo) with all modalities, or None."""
+    with engine.connect() as conn:
+        rows = conn.execute(consulta_latest()).all()
+    if not rows:
+        return None
+
+    return {
+        "id": rows[0][0],
+        "date": rows[0][1],
+        "modes": {clave_modalidad(r[2]): list(r[3:9]) for r in rows}
+    }
+
+@cronometrado
+def get_history(limit=50, before_id=None):
+    """
+    Returns one page of draws, newest first, in a single query.
+
+    Each row carries the Tradicional numbers as the representative set, falling
+    back to the first stored modality when Tradicional is missing.
+
+    Args:
+        limit (int): Maximum number of draws in the page.
+        before_id (int): Keyset cursor. Only draws with sorteo_id < before_id
+            are returned, so the next page is requested with the last id seen.
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(consulta_history(limit, before_id)).all()
+
+    history = []
+    for sid, group in groupby(rows, key=lambda r: r[0]):
+        group = list(group)
+        trad = next((r for r in group if "TRADICIONAL" in r[2].upper()), group[0])
+        history.append({
+            "id": sid,
+            "date": group[0][1],
+            "numbers": list(trad[3:9])
+        })
+    return history
@@ -0,0 +1,195 @@
+"""
+Streaming importer for quini6_historico.csv style files:
+
+    fecha,sorteo_id,modalidad,n1,n2,n3,n4,n5,n6
+    14-12-2025,3330,TRADICIONAL,00,25,26,28,34,41
+
+The file is read in chunks, validated with vectorized checks and bulk
+upserted, so memory stays flat whatever its size. Malformed lines and rows
+that fail validation are reported, never fatal.
+"""
+import argparse
+import bisect
+import csv
+import re
+import warnings
+import numpy as np
+import pandas as pd
+from database import TOTAL_NUMBERS, cerrar, filas_dataframe, guardar_sorteos_bulk
+from parser_sorteo import KEYWORDS
+
+NUM_COLUMNS = ['n1', 'n2', 'n3', 'n4', 'n5', 'n6']
+COLUMNAS = ['fecha', 'sorteo_id', 'modalidad'] + NUM_COLUMNS
+# Everything is read as text and converted explicitly, so one bad value
+# invalidates its row instead of the dtype of the whole chunk
+DTYPES = {c: str for c in COLUMNAS}
+CHUNK_SIZE = 100_000
+MAX_ERRORES = 1000  # Bad rows kept for the report (all of them are counted)
+# How pandas reports each line it drops with on_bad_lines="warn"
+RE_SALTEADA = re.compile(r"Skipping line (\d+): (.*)")
+
+def normalizar_fechas(fechas):
+    """dd-mm-yyyy or dd/mm/yyyy -> canonical dd/mm/yyyy, NaN when invalid."""
+    texto = fechas.fillna("").str.strip().str.replace("-", "/", regex=False)
+    parsed = pd.to_datetime(texto, format="%d/%m/%Y", errors="coerce")
+    return parsed.dt.strftime("%d/%m/%Y")
+
+def validar(chunk):
+    """
+    Normalizes one chunk and checks every row.
+
+    Returns:
+        (DataFrame of valid rows with typed columns, Series of error reasons
+        indexed like the invalid rows)
+    """
+    fechas = normalizar_fechas(chunk['fecha'])
+    modalidades = chunk['modalidad'].fillna("").str.strip().str.upper()
+    ids = pd.to_numeric(chunk['sorteo_id'], errors='coerce')
+    numeros = chunk[NUM_COLUMNS].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+    completos = ~np.isnan(numeros).any(axis=1)
+    en_rango = completos & ((numeros >= 0) & (numeros < TOTAL_NUMBERS) & (numeros == np.floor(numeros))).all(axis=1)
+    ordenados = np.sort(np.nan_to_num(numeros, nan=-1), axis=1)
+    unicos = (np.diff(ordenados, axis=1) > 0).all(axis=1)
+
+    # The first failing check is the reported reason
+    checks = [
+        ("invalid date", fechas.notna().to_numpy()),
+        ("invalid sorteo_id", (ids.notna() & (ids > 0) & (ids == ids.round())).to_numpy()),
+        ("unknown modalidad", modalidades.isin(list(KEYWORDS)).to_numpy()),
+        ("missing number", completos),
+        (f"number out of range 0-{TOTAL_NUMBERS - 1}", en_rango),
+        ("repeated number", unicos),
+    ]
+    razon = np.full(len(chunk), None, dtype=object)
+    for mensaje, ok in reversed(checks):
+        razon[~ok] = mensaje
+    valid = pd.isna(razon)
+
+    validas = pd.DataFrame({
+        'fecha': fechas[valid].to_numpy(),
+        'sorteo_id': ids[valid].to_numpy(dtype=np.int64),
+        'modalidad': modalidades[valid].to_numpy(),
+    })
+    for i, col in enumerate(NUM_COLUMNS):
+        validas[col] = numeros[valid, i].astype(np.int64)
+    return validas, pd.Series(razon[~valid], index=chunk.index[~valid])
+
+def _cabecera(path):
+    """
+    Header of the file and the wide lines it starts with.
+
+    pandas checks the field count of every line, except when the first data
+    line is wider than the header: it then silently uses the extra leading
+    fields as an index and shifts every column. Those lines are found here
+    and skipped explicitly.
+
+    Returns:
+        (header fields, [(0-based line number, field count)] to skip)
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = [c.strip() for c in next(reader, [])]
+        faltan = [c for c in COLUMNAS if c not in header]
+        if faltan:
+            raise ValueError(f"{path}: missing columns {', '.join(faltan)}")
+        anchas = []
+        for campos in reader:
+            if not campos:
+                continue  # Blank lines are ignored by pandas too
+            if len(campos) <= len(header):
+                break
+            anchas.append((reader.line_num - 1, len(campos)))
+    return header, anchas
+
+def _linea(fila, saltadas):
+    """1-based file line of the 0-based row pandas produced, given the sorted skipped lines."""
+    linea = fila + 2  # The header is line 1
+    for saltada in saltadas:
+        if saltada > linea:
+            break
+        linea += 1
+    return linea
+
+def importar(path, chunksize=CHUNK_SIZE, batch_size=5000, max_errores=MAX_ERRORES):
+    """
+    Streams a CSV into the sorteos table.
+
+    Returns:
+        dict: inserted, skipped (already stored), invalid (failed validation),
+        bad_lines (unparseable) and up to `max_errores` error details
+        ({"line": 1-based line of the file, "reason": ...}, for both kinds).
+    """
+    reporte = {"inserted": 0, "skipped": 0, "invalid": 0, "bad_lines": 0, "errors": []}
+
+    def anotar(error):
+        if len(reporte["errors"]) < max_errores:
+            reporte["errors"].append(error)
+
+    def filas_validas():
+        header, anchas = _cabecera(path)
+        saltadas = []  # Sorted 1-based lines pandas yields no row for
+        for linea, campos in anchas:
+            reporte["bad_lines"] += 1
+            saltadas.append(linea + 1)
+            anotar({"line": linea + 1, "reason": f"expected {len(header)} fields, saw {campos}"})
+
+        # No usecols: with it pandas stops rejecting lines that have too many fields.
+        # Blank lines are kept (and dropped below) so row positions map back to file lines.
+        reader = pd.read_csv(
+            path, dtype=DTYPES, chunksize=chunksize, skiprows=[linea for linea, _ in anchas],
+            on_bad_lines="warn", keep_default_na=False, na_values=[""], skipinitialspace=True,
+            skip_blank_lines=False,
+        )
+        with reader:
+            leidas = 0
+            while True:
+                with warnings.catch_warnings(record=True) as avisos:
+                    warnings.simplefilter("always", pd.errors.ParserWarning)
+                    chunk = next(reader, None)
+                for aviso in avisos:
+                    if issubclass(aviso.category, pd.errors.ParserWarning):
+                        # One message may describe several skipped lines
+                        for mensaje in str(aviso.message).strip().splitlines():
+                            reporte["bad_lines"] += 1
+                            match = RE_SALTEADA.match(mensaje.strip())
+                            if match:
+                                bisect.insort(saltadas, int(match.group(1)))
+                                anotar({"line": int(match.group(1)), "reason": match.group(2)})
+                            else:
+                                anotar({"line": None, "reason": mensaje.strip()})
+                if chunk is None:
+                    break
+
+                vacias = chunk.isna().all(axis=1).to_numpy()
+                validas, errores = validar(chunk[~vacias])
+                reporte["invalid"] += len(errores)
+                for idx, razon in errores.items():
+                    anotar({"line": _linea(leidas + chunk.index.get_loc(idx), saltadas), "reason": razon})
+                leidas += len(chunk)
+                yield from filas_dataframe(validas)
+
+    # One generator for the whole file: stats are rebuilt once at the end
+    result = guardar_sorteos_bulk(filas_validas(), batch_size=batch_size)
+    reporte["inserted"] = result["inserted"]
+    reporte["skipped"] = result["skipped"]
+    return reporte
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk load a quini6_historico.csv style file")
+    parser.add_argument("path", nargs="?", default="quini6_historico.csv")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="CSV rows per chunk")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per insert transaction")
+    parser.add_argument("--max-errors", type=int, default=20, help="Bad rows to print")
+    args = parser.parse_args(argv)
+
+    reporte = importar(args.path, args.chunksize, args.batch_size, max_errores=args.max_errors)
+    print(f"  [DB] Imported {args.path}: {reporte['inserted']} inserted, {reporte['skipped']} skipped, "
+          f"{reporte['invalid']} invalid rows, {reporte['bad_lines']} malformed lines")
+    for error in reporte["errors"]:
+        print(f"    line {error['line']}: {error['reason']}")
+    cerrar()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_JOBS_KEPT = 50
+
+class UpdateJob:
+    """State of one background run of the ingest pipeline."""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.state = "queued"  # queued -> running -> succeeded | failed
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+
+    @property
+    def done(self):
+        return self.state in ("succeeded", "failed")
+
+    def to_dict(self):
+        end = self.finished_at or time.time()
+        return {
+            "id": self.id,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_s": round(end - self.started_at, 3) if self.started_at else None,
+            "rows_ingested": self.result["inserted"] if self.result else 0,
+            "result": self.result,
+            "error": self.error,
+        }
+
+class JobManager:
+    """
+    Runs `target` in a background thread, single-flight: while a job is queued
+    or running, submit() returns that same job instead of starting another.
+    """
+
+    def __init__(self, target):
+        self._target = target
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._current = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="update-job")
+
+    def submit(self):
+        """
+        Returns:
+            tuple: (job, created) where created is False if an existing job was joined.
+        """
+        with self._lock:
+            if self._current is not None and not self._current.done:
+                return self._current, False
+
+            job = UpdateJob()
+            self._jobs[job.id] = job
+            while len(self._jobs) > MAX_JOBS_KEPT:
+                self._jobs.popitem(last=False)
+            self._current = job
+            self._executor.submit(self._run, job)
+            return job, True
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def _run(self, job):
+        job.state = "running"
+        job.started_at = time.time()
+        try:
+            job.result = self._target()
+            job.state = "succeeded"
+        except Exception as e:
+            job.error = str(e)
+            job.state = "failed"
+        finally:
+            job.finished_at = time.time()
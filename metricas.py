@@ -0,0 +1,207 @@
+"""
+In-process instrumentation: per-endpoint latency histograms, SQL queries and
+time per request (SQLAlchemy cursor events + a ContextVar), timers around
+analytics functions, Prometheus text exposition and opt-in cProfile reports.
+"""
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar, copy_context
+from sqlalchemy import event
+from database import engine
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# ?profile=1 is only honoured with QUINIMIND_PROFILE=1 (off by default: it
+# serializes requests on the profiler lock and exposes internals)
+PROFILE_ENABLED = os.environ.get("QUINIMIND_PROFILE", "0") == "1"
+PROFILE_LINES = 40
+
+class RequestStats:
+    """Per-request accumulator, reachable from any thread the request's work runs on."""
+
+    __slots__ = ("queries", "query_time", "profiler")
+
+    def __init__(self, profiler=None):
+        self.queries = 0
+        self.query_time = 0.0
+        self.profiler = profiler
+
+_current = ContextVar("request_stats", default=None)
+_profile_lock = threading.Lock()
+
+class Histogram:
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+_lock = threading.Lock()
+_latencias = defaultdict(Histogram)   # (method, path, status) -> Histogram
+_queries = defaultdict(lambda: [0, 0.0])  # path -> [queries, seconds]
+_funciones = defaultdict(lambda: [0, 0.0])  # function -> [calls, seconds]
+_sql_total = [0, 0.0]  # All queries, also outside requests
+
+@event.listens_for(engine, "before_cursor_execute")
+def _antes_query(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metricas_t0", []).append(time.perf_counter())
+
+@event.listens_for(engine, "after_cursor_execute")
+def _despues_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["metricas_t0"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_time += elapsed
+    with _lock:
+        _sql_total[0] += 1
+        _sql_total[1] += elapsed
+
+@event.listens_for(engine, "handle_error")
+def _error_query(context):
+    # A failed statement never reaches after_cursor_execute, so drop its start time here
+    conn = context.connection
+    if conn is not None and conn.info.get("metricas_t0"):
+        conn.info["metricas_t0"].pop()
+
+def cronometrado(fn):
+    """Records calls and cumulative time of `fn` under module.name."""
+    nombre = f"{fn.__module__}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - t0
+            with _lock:
+                entry = _funciones[nombre]
+                entry[0] += 1
+                entry[1] += elapsed
+    return wrapper
+
+def en_contexto(fn, *args, **kwargs):
+    """
+    Wraps a call for another thread: it runs inside a copy of the caller's
+    context (so queries count for the current request) and under the
+    request's profiler when ?profile=1 is active.
+    """
+    ctx = copy_context()
+
+    def call():
+        stats = _current.get()
+        if stats is not None and stats.profiler is not None:
+            with _profile_lock:  # Only one profiler can be active per process
+                return stats.profiler.runcall(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+    return functools.partial(ctx.run, call)
+
+def _informe(profiler):
+    profiler.create_stats()
+    if not profiler.stats:  # Async endpoints never run under the profiler
+        return "Nothing was profiled: the endpoint did no work in a worker thread.\n"
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).strip_dirs().sort_stats("cumulative").print_stats(PROFILE_LINES)
+    return out.getvalue()
+
+def instalar(app):
+    """Adds the timing/profiling middleware and GET /metrics to a FastAPI app."""
+    from fastapi import Request
+    from fastapi.responses import PlainTextResponse
+
+    @app.middleware("http")
+    async def medir_request(request: Request, call_next):
+        perfilar = PROFILE_ENABLED and request.query_params.get("profile") == "1"
+        stats = RequestStats(cProfile.Profile() if perfilar else None)
+        token = _current.set(stats)
+        t0 = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - t0
+
+        # Route template, not the raw URL, to keep label cardinality bounded
+        path = getattr(request.scope.get("route"), "path", None) or "unmatched"
+        with _lock:
+            _latencias[(request.method, path, response.status_code)].observe(elapsed)
+            entry = _queries[path]
+            entry[0] += stats.queries
+            entry[1] += stats.query_time
+
+        if perfilar:
+            header = (f"{request.method} {request.url.path}: {elapsed * 1000:.1f} ms, "
+                      f"{stats.queries} SQL queries in {stats.query_time * 1000:.1f} ms\n\n")
+            return PlainTextResponse(header + _informe(stats.profiler))
+        response.headers["X-DB-Queries"] = str(stats.queries)
+        response.headers["X-DB-Time-Ms"] = f"{stats.query_time * 1000:.2f}"
+        return response
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        """Prometheus text exposition of the collected metrics."""
+        return exposicion()
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+def exposicion():
+    """All metrics in Prometheus text format (version 0.0.4)."""
+    lines = []
+    with _lock:
+        lines.append("# HELP quinimind_request_duration_seconds HTTP request latency by endpoint.")
+        lines.append("# TYPE quinimind_request_duration_seconds histogram")
+        for (method, path, status), h in sorted(_latencias.items()):
+            base = _labels(method=method, path=path, status=status)
+            acumulado = 0
+            for bound, n in zip(BUCKETS, h.buckets):
+                acumulado += n
+                lines.append(f'quinimind_request_duration_seconds_bucket{{{base},le="{bound}"}} {acumulado}')
+            lines.append(f'quinimind_request_duration_seconds_bucket{{{base},le="+Inf"}} {h.count}')
+            lines.append(f"quinimind_request_duration_seconds_sum{{{base}}} {h.sum:.6f}")
+            lines.append(f"quinimind_request_duration_seconds_count{{{base}}} {h.count}")
+
+        lines.append("# HELP quinimind_request_db_queries_total SQL queries executed while serving each endpoint.")
+        lines.append("# TYPE quinimind_request_db_queries_total counter")
+        for path, (n, _) in sorted(_queries.items()):
+            lines.append(f"quinimind_request_db_queries_total{{{_labels(path=path)}}} {n}")
+        lines.append("# HELP quinimind_request_db_seconds_total Time spent in SQL while serving each endpoint.")
+        lines.append("# TYPE quinimind_request_db_seconds_total counter")
+        for path, (_, secs) in sorted(_queries.items()):
+            lines.append(f"quinimind_request_db_seconds_total{{{_labels(path=path)}}} {secs:.6f}")
+
+        lines.append("# HELP quinimind_db_queries_total All SQL queries executed by the process.")
+        lines.append("# TYPE quinimind_db_queries_total counter")
+        lines.append(f"quinimind_db_queries_total {_sql_total[0]}")
+        lines.append("# HELP quinimind_db_seconds_total Time spent in all SQL queries.")
+        lines.append("# TYPE quinimind_db_seconds_total counter")
+        lines.append(f"quinimind_db_seconds_total {_sql_total[1]:.6f}")
+
+        lines.append("# HELP quinimind_function_calls_total Calls of instrumented analytics functions.")
+        lines.append("# TYPE quinimind_function_calls_total counter")
+        for nombre, (n, _) in sorted(_funciones.items()):
+            lines.append(f"quinimind_function_calls_total{{{_labels(function=nombre)}}} {n}")
+        lines.append("# HELP quinimind_function_seconds_total Time spent in instrumented analytics functions.")
+        lines.append("# TYPE quinimind_function_seconds_total counter")
+        for nombre, (_, secs) in sorted(_funciones.items()):
+            lines.append(f"quinimind_function_seconds_total{{{_labels(function=nombre)}}} {secs:.6f}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,160 @@
+"""
+Single-pass parser for Quini 6 result pages: id, date and the four
+modalities are collected in one walk over the text nodes, which stops as
+soon as everything was found. Uses lxml when installed, else html.parser.
+"""
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree
+except ImportError:  # Optional speedup
+    etree = None
+
+# Texto de la modalidad en la página -> clave del JSON
+KEYWORDS = {
+    "TRADICIONAL": "tradicional",
+    "LA SEGUNDA": "laSegunda",
+    "REVANCHA": "revancha",
+    "SIEMPRE SALE": "siempreSale"
+}
+
+RE_ID = re.compile(r'(?:Sorteo N°|Nro\. Sorteo:)\s*(\d+)', re.IGNORECASE)
+RE_FECHA = re.compile(r'(\d{2}/\d{2}/\d{4})')
+RE_NUMERO = re.compile(r'^\d{1,2}$')
+
+# Text nodes scanned after a modality label before giving up on it
+MAX_STEPS = 50
+CHUNK_SIZE = 16 * 1024
+
+@dataclass
+class SorteoParseado:
+    """Typed result of parsing one draw page."""
+    sorteo_id: int
+    fecha: str  # dd/mm/yyyy
+    modos: dict = field(default_factory=lambda: {k: [] for k in KEYWORDS.values()})
+
+    def completo(self):
+        return all(len(nums) == 6 for nums in self.modos.values())
+
+    def to_json(self):
+        """Same shape the scraper writes to data.json."""
+        return {"id": self.sorteo_id, "date": self.fecha, "modes": self.modos}
+
+class _Textos(HTMLParser):
+    """Collects text nodes (outside script/style) as the HTML is fed."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.textos = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.textos.append(data)
+
+def _decode(html):
+    if isinstance(html, str):
+        return html
+    try:
+        return html.decode('utf-8')
+    except UnicodeDecodeError:
+        return html.decode('latin-1')
+
+def _iter_textos(html):
+    """Yields the page's text nodes in document order."""
+    if etree is not None:
+        root = etree.HTML(html if isinstance(html, bytes) else html.encode('utf-8'))
+        if root is None:
+            return
+        etree.strip_elements(root, 'script', 'style', with_tail=False)
+        yield from root.itertext()
+        return
+
+    html = _decode(html)
+    parser = _Textos()
+    for start in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[start:start + CHUNK_SIZE])
+        yield from parser.textos
+        parser.textos.clear()
+    parser.close()
+    yield from parser.textos
+
+def _numeros(txt):
+    """Numbers 0-45 in a text node: a single number or a dash separated list."""
+    if '-' in txt:
+        candidatos = (p.strip() for p in txt.split('-'))
+    else:
+        candidatos = (txt,)
+    return [int(p) for p in candidatos if RE_NUMERO.match(p) and int(p) <= 45]
+
+def parsear(html):
+    """
+    Parses a draw page (homepage or /quini6/sorteo-...htm).
+
+    Returns:
+        SorteoParseado: id 0 and today's date when they are not on the page,
+        empty lists for modalities that were not found.
+    """
+    sorteo_id = None
+    fecha = None
+    modos = {k: [] for k in KEYWORDS.values()}
+    pendientes = dict(KEYWORDS)  # Labels not seen yet
+    activos = []  # [json_key, found numbers, steps] being collected
+    anterior = ""
+
+    for raw in _iter_textos(html):
+        # Numbers for labels already seen
+        if activos:
+            txt = raw.strip()
+            for colector in activos:
+                colector[2] += 1
+                if txt:
+                    for val in _numeros(txt):
+                        if val not in colector[1]:
+                            colector[1].append(val)
+            for colector in [c for c in activos if len(c[1]) >= 6 or c[2] >= MAX_STEPS]:
+                modos[colector[0]] = sorted(colector[1][:6])
+                activos.remove(colector)
+
+        # Id and date (checked against the previous node too, labels are often in a separate tag)
+        if sorteo_id is None or fecha is None:
+            ventana = anterior + raw
+            if sorteo_id is None:
+                match_id = RE_ID.search(ventana)
+                if match_id:
+                    sorteo_id = int(match_id.group(1))
+            if fecha is None:
+                match_date = RE_FECHA.search(ventana)
+                if match_date:
+                    fecha = match_date.group(1)
+            if raw.strip():  # Whitespace between the label's tag and the value's doesn't count
+                anterior = raw
+
+        # New modality labels
+        if pendientes:
+            upper = raw.upper()
+            for key_text in [k for k in pendientes if k in upper]:
+                activos.append([pendientes.pop(key_text), [], 0])
+
+        if not pendientes and not activos and sorteo_id is not None and fecha is not None:
+            break
+
+    for json_key, found, _ in activos:
+        modos[json_key] = sorted(found[:6])
+
+    return SorteoParseado(
+        sorteo_id=sorteo_id or 0,
+        fecha=fecha or datetime.now().strftime("%d/%m/%Y"),
+        modos=modos
+    )
@@ -0,0 +1,73 @@
+import json
+import os
+import columnar
+import exportar
+import scrape_quini6
+from database import asegurar_estadisticas, cerrar, guardar_sorteos
+
+def _json_actual(path):
+    """Id del sorteo que ya tiene el data.json, o None."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get("id")
+    except (OSError, ValueError):
+        return None
+
+def actualizar(url=scrape_quini6.URL, session=None, data_json=scrape_quini6.DATA_JSON_PATH):
+    """
+    Ingest pipeline: fetch -> parse -> upsert into the DB -> refresh derived artifacts.
+
+    Shared by the API (/update), the dashboard, the CLI and the GitHub workflows.
+    When the draw is already stored and data.json is current, nothing downstream runs.
+
+    Returns:
+        dict: status ("updated" | "unchanged"), sorteo_id, fecha, inserted, skipped.
+
+    Raises:
+        scrape_quini6.ScraperError: the page could not be fetched or has no complete draw.
+    """
+    # Incremental stats only make sense on top of filled tables
+    asegurar_estadisticas()
+    data = scrape_quini6.obtener_ultimo_sorteo(url, session=session)
+    filas = scrape_quini6.filas_db(data)
+    if not filas:
+        raise scrape_quini6.ScraperError(f"El sorteo {data['id']} no tiene ninguna modalidad completa.")
+
+    result = guardar_sorteos(filas)
+    json_al_dia = _json_actual(data_json) == data["id"]
+    resumen = {
+        "status": "updated" if result["inserted"] or not json_al_dia else "unchanged",
+        "sorteo_id": data["id"],
+        "fecha": data["date"],
+        **result
+    }
+    if resumen["status"] == "unchanged":
+        print(f"  [DB] Sorteo {data['id']} ya estaba guardado, nada que actualizar.")
+        return resumen
+
+    print(f"  [DB] Sorteo {data['id']}: {result['inserted']} modalidades nuevas, {result['skipped']} repetidas")
+
+    # Derived artifacts. In-process caches notice the new data_version by themselves.
+    if not json_al_dia:
+        scrape_quini6.guardar_json(data, data_json)
+    if result["inserted"]:
+        manifest = exportar.exportar(os.path.join(os.path.dirname(data_json), "api"))
+        resumen["snapshot"] = manifest["version"]
+        if os.path.isdir(columnar.COLUMNAR_DIR):
+            # Only kept up to date once created with `python columnar.py`
+            for modalidad in sorted({f["modalidad"] for f in filas}):
+                columnar.actualizar(modalidad)
+    return resumen
+
+def main():
+    try:
+        actualizar()
+    except Exception as e:
+        print(f"❌ Error crítico: {e}")
+        return 1
+    finally:
+        cerrar()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -27,6 +27,38 @@ import {
   Cell
 } from 'recharts';
 
+// Backend URL (optional). Without it the app reads the static snapshot exported by exportar.py
+const API_URL = import.meta.env.VITE_API_URL;
+const SNAPSHOT_URL = "./api";
+
+// Loads a file of the current static snapshot, resolved through manifest.json
+let manifestPromise = null;
+const fetchSnapshot = async (path) => {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${SNAPSHOT_URL}/manifest.json`, { cache: "no-cache" }).then((res) => {
+      if (!res.ok) throw new Error("Snapshot manifest missing");
+      return res.json();
+    });
+  }
+  const manifest = await manifestPromise;
+  if (!manifest.files[path]) throw new Error(`Snapshot file missing: ${path}`);
+  const res = await fetch(`${SNAPSHOT_URL}/${manifest.base}${path}`);
+  if (!res.ok) throw new Error(`Snapshot fetch failed: ${path}`);
+  return res.json();
+};
+
+// Same strategy as analisis.get_prediction: 3 hot + 2 cold + random fill
+const predictFromSnapshot = async () => {
+  const [hot, cold] = await Promise.all([
+    fetchSnapshot("hot/tradicional.json"),
+    fetchSnapshot("cold/tradicional.json")
+  ]);
+  const picks = new Set(hot.slice(0, 3));
+  cold.filter((n) => !picks.has(n)).slice(0, 2).forEach((n) => picks.add(n));
+  while (picks.size < 6) picks.add(Math.floor(Math.random() * 46));
+  return [...picks].sort((a, b) => a - b);
+};
+
 // Generate mock history for statistics (Fallback)
 const generateHistory = (count) => {
   const history = [];
@@ -233,9 +265,12 @@ const PredictionEngine = ({ isPro, onUpgrade }) => {
   const generatePrediction = async () => {
     setLoading(true);
     try {
-      const res = await fetch(`${API_URL}/predict`);
-      const data = await res.json();
-      setPrediction(data);
+      if (API_URL) {
+        const res = await fetch(`${API_URL}/predict`);
+        setPrediction(await res.json());
+      } else {
+        setPrediction(await predictFromSnapshot());
+      }
     } catch (err) {
       console.error(err);
     } finally {
@@ -332,10 +367,14 @@ export default function App() {
         const dataDraw = await resDraw.json();
 
         setLatestDraw(dataDraw);
-        // For history, we either need another JSON or fallback to Mock. 
-        // Re-enabling Mock History for stats since user only asked for latest draw JSON.
-        // In a real app we'd export history.json too.
-        setHistory(generateHistory(50));
+        // Real history from the static snapshot, mock history if it wasn't exported
+        try {
+          const page = await fetchSnapshot("history/1.json");
+          setHistory(page.slice(0, 50));
+        } catch (snapshotErr) {
+          console.warn("Snapshot unavailable, using mock history", snapshotErr);
+          setHistory(generateHistory(50));
+        }
       } catch (err) {
         console.error("Failed to load data", err);
         setError(true);
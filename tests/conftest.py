@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# In-memory DB: must be set before database.py is first imported, it creates the engine at import time
+os.environ.setdefault("QUINIMIND_DB_URL", "sqlite://")
+
+FIXTURES_DIR = os.path.join(ROOT, "tests", "fixtures")
@@ -0,0 +1,26 @@
+from itertools import combinations
+import numpy as np
+import analisis
+import database
+from benchmarks.sintetico import generar_sorteos
+
+def _tickets_posibles(hot, cold, n_hot, n_cold):
+    """Tickets the recipe can produce when n_hot + n_cold == 6: hot-only numbers fit in
+    the n_hot picks and cold-only numbers in the n_cold ones."""
+    return sum(
+        1 for t in combinations(sorted(hot | cold), 6)
+        if len(set(t) - cold) <= n_hot and len(set(t) - hot) <= n_cold
+    )
+
+def test_generar_tickets_agota_la_receta():
+    database.init_db()
+    database.guardar_sorteos_bulk(database.filas_dataframe(generar_sorteos(500, "SIEMPRE SALE", seed=0)))
+    hot = set(analisis.get_hot_numbers("SIEMPRE SALE"))
+    cold = set(analisis.get_cold_numbers("SIEMPRE SALE"))
+    total = _tickets_posibles(hot, cold, 3, 3)
+
+    casi = analisis.generar_tickets("SIEMPRE SALE", total - 400, seed=0, n_hot=3, n_cold=3)
+    assert len(casi) == total - 400
+    todos = analisis.generar_tickets("SIEMPRE SALE", total + 1000, seed=0, n_hot=3, n_cold=3)
+    assert len(todos) == total
+    assert len(np.unique(todos, axis=0)) == total
@@ -0,0 +1,66 @@
+from unittest import mock
+import numpy as np
+from fastapi.testclient import TestClient
+import api
+import consultas
+import database
+from benchmarks.sintetico import generar_sorteos
+
+client = TestClient(api.app)
+
+def _frecuencias(modalidad):
+    numeros = consultas.sorteos(modalidad, ("numeros",))["numeros"]
+    return np.bincount(numeros.ravel(), minlength=database.TOTAL_NUMBERS).tolist()
+
+def test_heatmap_no_queda_viejo_tras_carga_masiva():
+    database.init_db()
+    df = generar_sorteos(200, "LA SEGUNDA", seed=7)
+    database.guardar_sorteos_bulk(database.filas_dataframe(df.iloc[:100]))
+    assert client.get("/stats/heatmap?modalidad=LA SEGUNDA").status_code == 200
+
+    rebuild = database.rebuild_estadisticas
+
+    def pedido_antes_del_rebuild(modalidad=None):
+        # A request between the last batch commit and the rebuild caches the old stats
+        client.get("/stats/heatmap?modalidad=LA SEGUNDA")
+        return rebuild(modalidad)
+
+    with mock.patch.object(database, "rebuild_estadisticas", pedido_antes_del_rebuild):
+        database.guardar_sorteos_bulk(database.filas_dataframe(df.iloc[100:]), batch_size=30)
+
+    heatmap = client.get("/stats/heatmap?modalidad=LA SEGUNDA").json()
+    assert [fila["Frecuencia"] for fila in heatmap] == _frecuencias("LA SEGUNDA")
+
+def test_modalidad_desconocida():
+    import cache_sorteos
+    antes = cache_sorteos.cache.stats()["modalidades"]
+    for url in ("/stats/window?modalidad=xyz", "/stats/ticket?numbers=1,2&modalidad=abc",
+                "/stats/heatmap?modalidad=q", "/predict?modalidad=z"):
+        assert client.get(url).status_code == 422, url
+    assert cache_sorteos.cache.stats()["modalidades"] == antes
+    assert client.get("/stats/window?modalidad=la segunda").status_code == 200
+
+def test_etag_304_e_invalidacion():
+    database.init_db()
+    url = "/history?limit=5"
+    primera = client.get(url)
+    etag = primera.headers["etag"]
+    assert "last-modified" not in primera.headers
+
+    repetida = client.get(url, headers={"If-None-Match": etag})
+    assert repetida.status_code == 304
+    assert repetida.headers["etag"] == etag and repetida.content == b""
+
+    # A new draw changes data_version, which drops the cached body and its ETag
+    nueva = {"sorteo_id": 990001, "fecha": "01/01/2030", "modalidad": "LA SEGUNDA",
+             "n1": 1, "n2": 2, "n3": 3, "n4": 4, "n5": 5, "n6": 6}
+    database.guardar_sorteos([nueva])
+    despues = client.get(url, headers={"If-None-Match": etag})
+    assert despues.status_code == 200
+    assert despues.headers["etag"] != etag
+    assert despues.json()[0]["id"] == 990001
+
+def test_k_fuera_de_rango():
+    for url in ("/stats/pairs?k=0", "/stats/pairs?k=1036", "/stats/triples?k=1001"):
+        assert client.get(url).status_code == 422, url
+    assert client.get("/stats/pairs?k=1035").status_code == 200
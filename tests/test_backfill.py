@@ -0,0 +1,38 @@
+"""
+Backfill run against the saved pages in tests/fixtures, served locally.
+
+The pages are reconstructions in the site's layout with the draws
+3328-3330 from quini6_historico.csv (the site itself is not reachable from
+CI). 3328 has no date in its body, so its date must come from the URL.
+"""
+from datetime import date
+from unittest import mock
+import requests
+from sqlalchemy import text
+import backfill
+import database
+from conftest import FIXTURES_DIR
+
+def test_backfill_fixtures():
+    database.init_db()
+    with backfill.servidor_fixtures(FIXTURES_DIR) as base_url:
+        job = backfill.Backfill(base_url, concurrencia=2, por_segundo=0, reintentos=0,
+                                batch_size=3, session=requests.Session())
+        job.agregar_ancla(3330, date(2025, 12, 14))
+        with mock.patch.object(database, "rebuild_estadisticas", wraps=database.rebuild_estadisticas) as rebuild:
+            resumen = job.ejecutar(3327, 3329)
+
+    assert resumen == {"fetched": 2, "missing": [3327], "failed": [], "inserted": 8, "skipped": 0}
+    # One rebuild per modality for the whole run, not one per batch
+    assert sorted(c.args[0] for c in rebuild.call_args_list) == sorted(backfill.scrape_quini6.KEYWORDS)
+
+    with database.engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT sorteo_id, modalidad, fecha, fecha_date, n1, n2, n3, n4, n5, n6 "
+            "FROM sorteos WHERE sorteo_id IN (3328, 3329) ORDER BY sorteo_id, modalidad"
+        )).all()
+    assert [tuple(r) for r in rows if r[1] == "TRADICIONAL"] == [
+        (3328, "TRADICIONAL", "07/12/2025", "2025-12-07", 1, 7, 15, 29, 40, 45),
+        (3329, "TRADICIONAL", "10/12/2025", "2025-12-10", 3, 5, 12, 24, 29, 41),
+    ]
+    assert {r[2] for r in rows if r[0] == 3328} == {"07/12/2025"}
@@ -0,0 +1,21 @@
+import pytest
+import database
+
+def test_explain_sin_scans(capsys):
+    database.init_db()
+    database.explain()
+    salida = capsys.readouterr().out
+    assert salida.count("--- ") == len(database.consultas_endpoints())
+    assert "SCAN sorteos" not in salida
+
+def test_metricas_query_fallida_no_deja_inicio():
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+    import metricas  # noqa: F401 -- registers the cursor listeners
+
+    with database.engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM tabla_que_no_existe"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info["metricas_t0"] == []
@@ -0,0 +1,48 @@
+"""The stats kept on ingest must match a rebuild from scratch, whatever the insert order."""
+import random
+from sqlalchemy import text
+import database
+from benchmarks.sintetico import generar_sorteos
+
+MODALIDAD = "PRUEBA INCREMENTAL"  # Not used by any other test
+
+def _tablas(modalidad):
+    consultas = {
+        "estadisticas": "SELECT numero, frecuencia, ultimo_sorteo, ultima_fecha, ventana "
+                        "FROM estadisticas WHERE modalidad = :m ORDER BY numero",
+        "pares": "SELECT a, b, cuenta FROM pares WHERE modalidad = :m AND cuenta > 0 ORDER BY a, b",
+        "ternas": "SELECT a, b, c, cuenta FROM ternas WHERE modalidad = :m AND cuenta > 0 ORDER BY a, b, c",
+    }
+    with database.engine.connect() as conn:
+        return {nombre: [tuple(r) for r in conn.execute(text(sql), {"m": modalidad})]
+                for nombre, sql in consultas.items()}
+
+def test_incremental_igual_a_rebuild():
+    database.init_db()
+    filas = list(database.filas_dataframe(generar_sorteos(database.HOT_WINDOW + 30, MODALIDAD, seed=3)))
+    # Newest draws first, then an out-of-order backfill of the older ones and a repeated draw
+    recientes, viejas = filas[40:], filas[:40]
+    random.Random(0).shuffle(viejas)
+    for fila in recientes + viejas + [filas[10]]:
+        database.guardar_sorteos([fila])
+
+    incremental = _tablas(MODALIDAD)
+    assert len(incremental["estadisticas"]) == database.TOTAL_NUMBERS
+    assert sum(r[4] for r in incremental["estadisticas"]) == database.HOT_WINDOW * 6
+    database.rebuild_estadisticas(MODALIDAD)
+    assert _tablas(MODALIDAD) == incremental
+
+def test_bulk_cuenta_insertados_y_salteados():
+    database.init_db()
+    modalidad = "PRUEBA BULK"
+    filas = list(database.filas_dataframe(generar_sorteos(25, modalidad, seed=4)))
+
+    # batch_size smaller than the input so the counts add up across batches
+    assert database.guardar_sorteos_bulk(filas[:10], batch_size=4) == {"inserted": 10, "skipped": 0}
+    assert database.guardar_sorteos_bulk(filas[5:], batch_size=4) == {"inserted": 15, "skipped": 5}
+    assert database.guardar_sorteos_bulk(filas, batch_size=4) == {"inserted": 0, "skipped": 25}
+
+    antes = _tablas(modalidad)
+    assert sum(r[1] for r in antes["estadisticas"]) == 25 * 6
+    database.rebuild_estadisticas(modalidad)
+    assert _tablas(modalidad) == antes
@@ -0,0 +1,26 @@
+import importar_csv
+
+CSV = """fecha,sorteo_id,modalidad,n1,n2,n3,n4,n5,n6
+01-01-2020,900001,REVANCHA,1,2,3,4,5,6,7
+01-01-2020,900002,REVANCHA,1,2,3,4,5,6
+
+01-01-2020,900003,REVANCHA,1,2,3,4,5,6
+01-01-2020,900004,REVANCHA,1,2,3,4,5,6,9
+01-01-2020,abc,REVANCHA,1,2,3,4,5,6
+01-01-2020,900006,REVANCHA,1,2,3,4,5,99
+"""
+
+def test_importar_reporta_lineas_del_archivo(tmp_path):
+    path = tmp_path / "historico.csv"
+    path.write_text(CSV, encoding="utf-8")
+    # Chunks of 2 rows: the line bookkeeping has to carry over between chunks
+    for chunksize in (2, 100):
+        reporte = importar_csv.importar(str(path), chunksize=chunksize)
+        assert (reporte["invalid"], reporte["bad_lines"]) == (2, 2)
+        assert reporte["errors"] == [
+            {"line": 2, "reason": "expected 9 fields, saw 10"},
+            {"line": 6, "reason": "expected 9 fields, saw 10"},
+            {"line": 7, "reason": "invalid sorteo_id"},
+            {"line": 8, "reason": "number out of range 0-45"},
+        ]
+    assert reporte["inserted"] + reporte["skipped"] == 2
@@ -0,0 +1,49 @@
+"""Starting the API on a quini6.db written by the first release (no typed columns, no stats tables)."""
+import os
+import sqlite3
+import subprocess
+import sys
+from conftest import ROOT
+
+ESQUEMA_ORIGINAL = """
+CREATE TABLE sorteos (
+    id INTEGER NOT NULL, fecha VARCHAR, sorteo_id INTEGER, modalidad VARCHAR,
+    n1 INTEGER, n2 INTEGER, n3 INTEGER, n4 INTEGER, n5 INTEGER, n6 INTEGER,
+    PRIMARY KEY (id),
+    CONSTRAINT uix_sorteo_modalidad UNIQUE (sorteo_id, modalidad)
+);
+CREATE INDEX ix_sorteos_sorteo_id ON sorteos (sorteo_id);
+INSERT INTO sorteos (fecha, sorteo_id, modalidad, n1, n2, n3, n4, n5, n6) VALUES
+    ('10/12/2025', 3329, 'TRADICIONAL', 3, 5, 12, 24, 29, 41),
+    ('14-12-2025', 3330, 'TRADICIONAL', 0, 25, 26, 28, 34, 41);
+"""
+
+ARRANQUE = """
+from fastapi.testclient import TestClient
+import api
+response = TestClient(api.app).get("/stats/heatmap")
+assert response.status_code == 200, response.text
+print(response.json()[41]["Frecuencia"])
+"""
+
+def test_api_arranca_con_base_original(tmp_path):
+    path = tmp_path / "quini6.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(ESQUEMA_ORIGINAL)
+
+    env = {**os.environ, "QUINIMIND_DB_URL": f"sqlite:///{path}"}
+    # Twice: the second start must find the migrated schema and filled stats
+    for _ in range(2):
+        # A fresh interpreter, so `import api` is the first import of every module
+        result = subprocess.run([sys.executable, "-c", ARRANQUE], cwd=ROOT, env=env,
+                                capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split()[-1] == "2"
+
+    with sqlite3.connect(path) as conn:
+        # Migrated once: later starts skip the full-table backfills
+        assert conn.execute("PRAGMA user_version").fetchone()[0] >= 1
+        assert conn.execute("SELECT COUNT(*) FROM estadisticas").fetchone()[0] == 46
+        assert conn.execute("SELECT COUNT(*) FROM pares WHERE a = 0 AND b = 25").fetchone()[0] == 1
+        assert conn.execute("SELECT fecha_date, mascara FROM sorteos WHERE sorteo_id = 3330").fetchone() == (
+            "2025-12-14", sum(1 << n for n in (0, 25, 26, 28, 34, 41)))
@@ -0,0 +1,36 @@
+"""parser_sorteo against the saved pages in tests/fixtures and their expected output (esperado.json)."""
+import json
+import os
+from datetime import datetime
+import pytest
+import parser_sorteo
+from conftest import FIXTURES_DIR
+
+with open(os.path.join(FIXTURES_DIR, "esperado.json"), encoding="utf-8") as f:
+    ESPERADO = json.load(f)
+
+BACKENDS = ["html.parser"] + (["lxml"] if parser_sorteo.etree is not None else [])
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    if request.param == "html.parser":
+        monkeypatch.setattr(parser_sorteo, "etree", None)
+    return request.param
+
+@pytest.mark.parametrize("pagina", sorted(ESPERADO))
+def test_parsear_fixture(pagina, backend):
+    with open(os.path.join(FIXTURES_DIR, pagina), "rb") as f:
+        resultado = parser_sorteo.parsear(f.read())
+
+    esperado = dict(ESPERADO[pagina])
+    # null: the page has no date, the parser falls back to today's
+    if esperado["date"] is None:
+        esperado["date"] = datetime.now().strftime("%d/%m/%Y")
+    assert resultado.to_json() == esperado
+    assert resultado.completo()
+
+def test_parsear_pagina_vacia():
+    resultado = parser_sorteo.parsear(b"<html><body><p>Sin resultados</p></body></html>")
+    assert resultado.sorteo_id == 0
+    assert resultado.modos == {k: [] for k in parser_sorteo.KEYWORDS.values()}
+    assert not resultado.completo()
@@ -0,0 +1,54 @@
+import numpy as np
+from cache_sorteos import derivado
+from database import TOTAL_NUMBERS
+
+def one_hot(numeros):
+    """(n_draws x 6) numbers -> (n_draws x 46) boolean membership matrix."""
+    matriz = np.zeros((len(numeros), TOTAL_NUMBERS), dtype=bool)
+    valid = (numeros >= 0) & (numeros < TOTAL_NUMBERS)
+    rows = np.broadcast_to(np.arange(len(numeros))[:, None], numeros.shape)
+    matriz[rows[valid], numeros[valid]] = True
+    return matriz
+
+def prefix_sums(onehot):
+    """(n_draws x 46) membership -> (n_draws + 1 x 46) int32 counts, row k = first k draws."""
+    prefix = np.zeros((len(onehot) + 1, TOTAL_NUMBERS), dtype=np.int32)
+    prefix[1:] = np.cumsum(onehot, axis=0, dtype=np.int32)
+    return prefix
+
+class PrefixCounts:
+    """
+    Cumulative per-number occurrence counts indexed by draw position:
+    prefix[k, n] = appearances of n in the first k draws (ascending sorteo_id).
+    The frequency of every number over any window of draws [i, j) is then
+    prefix[j] - prefix[i].
+    """
+
+    __slots__ = ("ids", "prefix")
+
+    def __init__(self, ids, numeros):
+        self.ids = ids
+        self.prefix = prefix_sums(one_hot(numeros))
+        self.prefix.flags.writeable = False
+
+    def __len__(self):
+        return len(self.ids)
+
+    def contar(self, i, j):
+        """Counts of every number over draw positions [i, j)."""
+        return self.prefix[j] - self.prefix[i]
+
+    def posiciones(self, desde_id=None, hasta_id=None):
+        """Positions [i, j) of the draws with desde_id <= sorteo_id <= hasta_id."""
+        i = 0 if desde_id is None else int(np.searchsorted(self.ids, desde_id, side="left"))
+        j = len(self.ids) if hasta_id is None else int(np.searchsorted(self.ids, hasta_id, side="right"))
+        return i, max(i, j)
+
+    def ultimos(self, last_n):
+        """Counts over the last `last_n` draws."""
+        total = len(self.ids)
+        return self.contar(max(total - max(last_n, 0), 0), total)
+
+def get_prefix(modalidad):
+    """PrefixCounts of a modality, built once per data version of the draw cache."""
+    return derivado(modalidad, "prefix", lambda draws: PrefixCounts(draws.ids, draws.numeros))